@@ -0,0 +1,166 @@
+import numpy as np
+from typing import Iterable, Sequence, Tuple
+from core.curve import (Curve3D, FrameBundle, _check_fields, _eval_jet,
+                        _jet_order, _piece_lengths, _speed_integral, frame_from_jet)
+
+
+class CurveCollection:
+    """
+    Набор кривых Curve3D с общей векторной вычислительной частью
+
+    Коэффициенты всех кривых хранятся подряд в одном массиве
+    (ragged-раскладка без выравнивания): кусок сплайна ищется одним
+    searchsorted по ключам «t + сдвиг кривой», поэтому пары
+    (curve_id, t) для любых кривых вычисляются за один вызов.
+    """
+
+    def __init__(self, curves: Sequence[Curve3D]):
+        """
+        Args:
+            curves: кривые набора (их сплайны строятся, если еще не построены)
+        """
+        if len(curves) == 0:
+            raise ValueError("CurveCollection needs at least one curve")
+
+        self.curves = list(curves)
+        breaks = [curve.breaks for curve in self.curves]
+        counts = np.array([len(b) - 1 for b in breaks])
+
+        # piece_offsets[k] — индекс первого куска кривой k
+        self.piece_offsets = np.concatenate(([0], np.cumsum(counts)))
+        self.coeffs = np.ascontiguousarray(np.concatenate([curve.coeffs for curve in self.curves]))
+        self.left = np.concatenate([b[:-1] for b in breaks])
+        self.right = np.concatenate([b[1:] for b in breaks])
+
+        # Начало и конец параметра каждой кривой
+        self.t_min = np.array([b[0] for b in breaks])
+        self.t_max = np.array([b[-1] for b in breaks])
+
+        # ★ Ключи поиска: кривая k занимает отрезок [k * stride, (k + 1) * stride)
+        self._stride = float(np.max(self.t_max - self.t_min)) + 1.0
+        curve_of_piece = np.repeat(np.arange(len(self.curves)), counts)
+        self._keys = self.left - self.t_min[curve_of_piece] + self._stride * curve_of_piece
+
+        self._cum_lengths = None
+
+    @classmethod
+    def from_points(cls, point_sets: Iterable[np.ndarray]) -> "CurveCollection":
+        """Построить набор из списка массивов контрольных точек (N_k, 3)"""
+        return cls([Curve3D(points, lazy=True) for points in point_sets])
+
+    def __len__(self):
+        return len(self.curves)
+
+    def __getitem__(self, curve_id: int) -> Curve3D:
+        return self.curves[curve_id]
+
+    # ============= ВЫЧИСЛЕНИЕ =============
+
+    def _broadcast(self, curve_ids, t) -> Tuple[np.ndarray, np.ndarray]:
+        """Привести curve_ids и t к одномерным массивам одной длины"""
+        curve_ids, t = np.broadcast_arrays(np.asarray(curve_ids, dtype=np.intp),
+                                           np.asarray(t, dtype=float))
+        return curve_ids.ravel(), t.ravel()
+
+    def _locate(self, curve_ids: np.ndarray, t: np.ndarray) -> np.ndarray:
+        """Глобальный индекс куска для пар (curve_id, t)"""
+        keys = t - self.t_min[curve_ids] + self._stride * curve_ids
+        idx = np.searchsorted(self._keys, keys, side='right') - 1
+        # Выход за пределы кривой продолжает ее крайний кусок
+        return np.clip(idx, self.piece_offsets[curve_ids], self.piece_offsets[curve_ids + 1] - 1)
+
+    def jet(self, curve_ids, t, order: int = 3) -> Tuple[np.ndarray, ...]:
+        """
+        Позиция и производные до порядка order для пар (curve_id, t)
+
+        Args:
+            curve_ids: номера кривых (скаляр или массив)
+            t: параметры (скаляр или массив, транслируется с curve_ids)
+
+        Returns:
+            (P, dP/dt, ...) — массивы (M, 3)
+        """
+        curve_ids, t = self._broadcast(curve_ids, t)
+        idx = self._locate(curve_ids, t)
+        return _eval_jet(self.coeffs[idx], t - self.left[idx], order)
+
+    def frame_bundle(self, curve_ids, t, fields: Iterable[str] = None) -> FrameBundle:
+        """Frenet frame и связанные величины для пар (curve_id, t)"""
+        fields = _check_fields(fields)
+        return frame_from_jet(self.jet(curve_ids, t, _jet_order(fields)), fields)
+
+    def position(self, curve_ids, t) -> np.ndarray:
+        """Позиции P (M, 3)"""
+        return self.jet(curve_ids, t, 0)[0]
+
+    def frenet_frame(self, curve_ids, t) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(T, N, B) для пар (curve_id, t)"""
+        return self.frame_bundle(curve_ids, t, ('tangent', 'normal', 'binormal')).frame
+
+    def curvature(self, curve_ids, t) -> np.ndarray:
+        """Кривизна κ для пар (curve_id, t)"""
+        return self.frame_bundle(curve_ids, t, ('curvature',)).curvature
+
+    def torsion(self, curve_ids, t) -> np.ndarray:
+        """Кручение τ для пар (curve_id, t)"""
+        return self.frame_bundle(curve_ids, t, ('torsion',)).torsion
+
+    def grid(self, t: np.ndarray, fields: Iterable[str] = None, curve_ids=None) -> FrameBundle:
+        """
+        ★ Все кривые × все t за один вызов
+
+        Args:
+            t: (M,) параметры, общие для всех кривых
+            fields: нужные поля (None — все)
+            curve_ids: подмножество кривых (None — все K)
+
+        Returns:
+            FrameBundle с полями (K, M, 3) / (K, M)
+        """
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        if curve_ids is None:
+            curve_ids = np.arange(len(self.curves))
+        curve_ids = np.atleast_1d(np.asarray(curve_ids, dtype=np.intp))
+
+        fields = _check_fields(fields)
+        flat = self.frame_bundle(np.repeat(curve_ids, len(t)), np.tile(t, len(curve_ids)), fields)
+
+        shape = (len(curve_ids), len(t))
+        return FrameBundle(**{name: getattr(flat, name).reshape(shape + getattr(flat, name).shape[1:])
+                              for name in fields})
+
+    # ============= ДЛИНА ДУГИ =============
+
+    @property
+    def cum_lengths(self) -> np.ndarray:
+        """
+        Накопленная длина по всем кускам всех кривых подряд
+
+        Длина кривой k — cum_lengths[piece_offsets[k + 1]] - cum_lengths[piece_offsets[k]]
+        """
+        if self._cum_lengths is None:
+            lengths = _piece_lengths(self.coeffs, self.right - self.left)
+            self._cum_lengths = np.concatenate(([0], np.cumsum(lengths)))
+        return self._cum_lengths
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Полная длина каждой кривой (K,)"""
+        cum = self.cum_lengths
+        return cum[self.piece_offsets[1:]] - cum[self.piece_offsets[:-1]]
+
+    def length_at_t(self, curve_ids, t) -> np.ndarray:
+        """Длина дуги s(t) от начала кривой для пар (curve_id, t)"""
+        curve_ids, t = self._broadcast(curve_ids, t)
+        t = np.clip(t, self.t_min[curve_ids], self.t_max[curve_ids])
+        idx = self._locate(curve_ids, t)
+        cum = self.cum_lengths
+        return (cum[idx] - cum[self.piece_offsets[curve_ids]]
+                + _speed_integral(self.coeffs[idx], t - self.left[idx]))
+
+    def arc_length(self, curve_ids, t_start=0.0, t_end=1.0) -> np.ndarray:
+        """Длина дуги от t_start до t_end для каждой пары"""
+        return self.length_at_t(curve_ids, t_end) - self.length_at_t(curve_ids, t_start)
+
+    def __repr__(self):
+        return f"CurveCollection(curves={len(self.curves)}, pieces={len(self.coeffs)})"
@@ -1,100 +1,750 @@
+import bisect
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from scipy.interpolate import CubicSpline
-from typing import Tuple
+from scipy.spatial import cKDTree
+from typing import Iterable, Iterator, Optional, Tuple
+
+
+FRAME_FIELDS = ('position', 'tangent', 'normal', 'binormal',
+                'curvature', 'torsion', 'speed', 'radius')
+VECTOR_FIELDS = ('position', 'tangent', 'normal', 'binormal')
+
+# Порядок производной, нужный для каждого поля
+_FIELD_ORDER = {
+    'position': 0,
+    'tangent': 1,
+    'speed': 1,
+    'normal': 2,
+    'binormal': 2,
+    'curvature': 2,
+    'radius': 2,
+    'torsion': 3,
+}
+
+
+class FrameBundle:
+    """
+    Frenet frame и связанные величины в точках t
+
+    Поля, которые не запрашивались, равны None.
+    Векторные поля — (M, 3), скалярные — (M,).
+    """
+
+    __slots__ = FRAME_FIELDS
+
+    def __init__(self, **values):
+        for name in FRAME_FIELDS:
+            setattr(self, name, values.get(name))
+
+    @property
+    def frame(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(T, N, B)"""
+        return self.tangent, self.normal, self.binormal
+
+    def __repr__(self):
+        present = [name for name in FRAME_FIELDS if getattr(self, name) is not None]
+        return f"FrameBundle({', '.join(present)})"
+
+
+def _check_fields(fields: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Проверить список полей (None — все поля)"""
+    if fields is None:
+        return FRAME_FIELDS
+    fields = tuple(fields)
+    for name in fields:
+        if name not in _FIELD_ORDER:
+            raise ValueError(f"Unknown frame field: {name}")
+    return fields
+
+
+def _jet_order(fields: Tuple[str, ...]) -> int:
+    """Максимальный порядок производной для набора полей"""
+    return max((_FIELD_ORDER[name] for name in fields), default=0)
+
+
+def frame_from_jet(derivs: Tuple[np.ndarray, ...], fields: Tuple[str, ...]) -> FrameBundle:
+    """
+    Frenet frame в замкнутой форме по уже вычисленным производным
+
+    T = v / |v|
+    B = (v × a) / |v × a|
+    N = B × T
+    κ = |v × a| / |v|³
+    τ = (v × a) · j / |v × a|²
+    """
+    fields = set(fields)
+    values = {}
+
+    if 'position' in fields:
+        values['position'] = derivs[0]
+
+    if len(derivs) < 2:
+        return FrameBundle(**values)
+
+    vel = derivs[1]
+    speed = np.linalg.norm(vel, axis=1)
+
+    if 'speed' in fields:
+        values['speed'] = speed
+
+    if fields & {'tangent', 'normal'}:
+        norms = speed[:, np.newaxis].copy()
+        norms[norms < 1e-10] = 1  # избегаем деления на 0
+        tangent = vel / norms
+        if 'tangent' in fields:
+            values['tangent'] = tangent
+
+    if len(derivs) < 3:
+        return FrameBundle(**values)
+
+    cross = np.cross(vel, derivs[2])
+    cross_norm = np.linalg.norm(cross, axis=1)
+
+    if fields & {'binormal', 'normal'}:
+        binormal = cross / (cross_norm[:, np.newaxis] + 1e-10)
+        if 'binormal' in fields:
+            values['binormal'] = binormal
+        if 'normal' in fields:
+            values['normal'] = np.cross(binormal, tangent)
+
+    if fields & {'curvature', 'radius'}:
+        curvature = cross_norm / (speed ** 3 + 1e-10)
+        if 'curvature' in fields:
+            values['curvature'] = curvature
+        if 'radius' in fields:
+            with np.errstate(divide='ignore'):
+                values['radius'] = np.where(curvature > 1e-10, 1.0 / curvature, np.inf)
+
+    if 'torsion' in fields:
+        values['torsion'] = np.sum(cross * derivs[3], axis=1) / (cross_norm ** 2 + 1e-10)
+
+    return FrameBundle(**values)
+
+
+def _eval_jet(c: np.ndarray, dx: np.ndarray, order: int) -> Tuple[np.ndarray, ...]:
+    """
+    Схема Горнера для кусков кубического сплайна
+
+    Args:
+        c: (M, 4, 3) коэффициенты куска для каждой точки (старшая степень первой)
+        dx: (M,) смещение от левого узла куска
+        order: максимальный порядок производной (0-3)
+    """
+    c0, c1, c2, c3 = c[:, 0], c[:, 1], c[:, 2], c[:, 3]
+    dx = dx[:, np.newaxis]
+
+    result = [((c0 * dx + c1) * dx + c2) * dx + c3]
+    if order >= 1:
+        result.append((3 * c0 * dx + 2 * c1) * dx + c2)
+    if order >= 2:
+        result.append(6 * c0 * dx + 2 * c1)
+    if order >= 3:
+        result.append(6 * c0)
+    return tuple(result)
+
+
+def _douglas_peucker(points: np.ndarray, tol: float) -> np.ndarray:
+    """
+    Индексы точек, которые оставляет упрощение Дугласа–Пекера
+
+    Все отрезки одного уровня рекурсии обрабатываются сразу:
+    расстояния до хорд считаются одним массивом, максимум по
+    каждому отрезку — через np.maximum.reduceat.
+    """
+    n = len(points)
+    keep = np.zeros(n, dtype=bool)
+    keep[[0, -1]] = True
+
+    starts, ends = np.array([0]), np.array([n - 1])
+    while len(starts):
+        counts = ends - starts - 1
+        has_interior = counts > 0
+        starts, ends, counts = starts[has_interior], ends[has_interior], counts[has_interior]
+        if not len(starts):
+            break
+
+        # Внутренние точки всех отрезков подряд
+        first = np.cumsum(counts) - counts
+        segment = np.repeat(np.arange(len(starts)), counts)
+        idx = starts[segment] + 1 + np.arange(counts.sum()) - first[segment]
+
+        a, b = points[starts][segment], points[ends][segment]
+        chord = b - a
+        offset = points[idx] - a
+        s = np.clip(np.sum(offset * chord, axis=1) / np.maximum(np.sum(chord ** 2, axis=1), 1e-300), 0, 1)
+        distance = np.linalg.norm(offset - s[:, np.newaxis] * chord, axis=1)
+
+        # Самая далекая точка каждого отрезка
+        max_distance = np.maximum.reduceat(distance, first)
+        candidates = np.flatnonzero(distance == max_distance[segment])
+        _, first_candidate = np.unique(segment[candidates], return_index=True)
+        farthest = idx[candidates[first_candidate]]
+
+        split = max_distance > tol
+        keep[farthest[split]] = True
+        starts = np.concatenate((starts[split], farthest[split]))
+        ends = np.concatenate((farthest[split], ends[split]))
+
+    return np.flatnonzero(keep)
+
+
+# Узлы и веса Гаусса–Лежандра на [-1, 1]
+_GL_NODES, _GL_WEIGHTS = np.polynomial.legendre.leggauss(8)
+
+
+def _speed_integral(c: np.ndarray, width: np.ndarray) -> np.ndarray:
+    """
+    ∫ |dP/dt| по [x_i, x_i + width] для каждого куска (Гаусс–Лежандр)
+
+    Args:
+        c: (M, 4, 3) коэффициенты кусков
+        width: (M,) длина отрезка интегрирования от левого узла куска
+    """
+    half = 0.5 * width[:, np.newaxis, np.newaxis]
+    dx = half * (1 + _GL_NODES[np.newaxis, :, np.newaxis])
+    c0, c1, c2 = c[:, np.newaxis, 0], c[:, np.newaxis, 1], c[:, np.newaxis, 2]
+
+    vel = (3 * c0 * dx + 2 * c1) * dx + c2
+    speed = np.linalg.norm(vel, axis=2)
+    return half[:, 0, 0] * (speed @ _GL_WEIGHTS)
+
+
+def _piece_lengths(coeffs: np.ndarray, widths: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    """Длины кусков сплайна; считаются блоками по chunk, чтобы ограничить память"""
+    lengths = np.empty(len(widths))
+    for start in range(0, len(widths), chunk):
+        stop = start + chunk
+        lengths[start:stop] = _speed_integral(coeffs[start:stop], widths[start:stop])
+    return lengths
 
 
 class Curve3D:
     """Параметрическая 3D кривая на основе CubicSpline"""
 
-    def __init__(self, points: np.ndarray):
+    # Таблицы, которые строятся сразу (если не lazy); остальные
+    # (например, 'scalar') — только при первом обращении.
+    # Каждая строится методом _build_<имя>
+    TABLES = ('spline', 'arc_length')
+
+    # Таблицы из одних массивов — их можно сохранять на диск
+    ARRAY_TABLES = ('spline', 'arc_length', 'rmf')
+
+    # Число узлов таблицы rotation-minimizing frame
+    RMF_SAMPLES = 2048
+    # ...но не меньше RMF_PER_PIECE узлов на кусок сплайна
+    RMF_PER_PIECE = 4
+
+    # Пространственный индекс: точность ломаной и макс. число отрезков по длине
+    INDEX_TOL = 1e-3
+    INDEX_SEGMENTS = 4096
+
+    def __init__(self, points: np.ndarray, lazy: bool = False, simplify_tol: float = None):
         """
         Args:
             points: (N, 3) массив контрольных точек
+            lazy: не строить сплайн и таблицы сразу, а при первом обращении
+            simplify_tol: перед построением сплайна упростить точки
+                          (Дуглас–Пекер с допуском simplify_tol);
+                          итог — в simplify_report
         """
         self.points = points
         self.t_param = np.linspace(0, 1, len(points))
+        self.simplify_tol = simplify_tol
+        self.simplify_report = None
 
-        # Создаем сплайны для x, y, z
-        self.spline_x = CubicSpline(self.t_param, points[:, 0], bc_type='not-a-knot')
-        self.spline_y = CubicSpline(self.t_param, points[:, 1], bc_type='not-a-knot')
-        self.spline_z = CubicSpline(self.t_param, points[:, 2], bc_type='not-a-knot')
+        self._tables = {}
+        self.build_times = {}  # имя таблицы → время построения в секундах
+        self._nested_build_time = 0.0  # время вложенных построений текущей таблицы
 
-        # Предварительно вычисляем длину кривой
-        self._precompute_arc_length()
+        if not lazy:
+            self.precompute()
 
-    def _precompute_arc_length(self, num_samples=1000):
-        """Предварительно вычисляем накопленную длину"""
-        t_samples = np.linspace(0, 1, num_samples)
-        positions = self.position(t_samples)
+    @classmethod
+    def from_file(cls, path: str, mmap: bool = True, start: int = None, stop: int = None,
+                  dtype: str = None, lazy: bool = False) -> "Curve3D":
+        """
+        ★ Кривая по контрольным точкам из файла
 
-        # Дифференциальные отрезки длины
-        diffs = np.diff(positions, axis=0)
-        segment_lengths = np.linalg.norm(diffs, axis=1)
+        Форматы:
+            .npy — стандартный NumPy (N, 3)
+            остальное — сырые little-endian float подряд x0 y0 z0 x1 ...;
+            тип из dtype, иначе по расширению (.f32 — float32, иначе float64)
 
-        self.cum_lengths = np.concatenate(([0], np.cumsum(segment_lengths)))
-        self.total_length = self.cum_lengths[-1]
-        self.t_samples = t_samples
+        При mmap файл отображается в память без чтения целиком; срез
+        [start:stop] — тоже отображение, копируется (в float64 при
+        построении сплайна) только выбранное окно точек.
+        """
+        if str(path).endswith('.npy'):
+            points = np.load(path, mmap_mode='r' if mmap else None)
+        else:
+            if dtype is None:
+                dtype = '<f4' if str(path).endswith('.f32') else '<f8'
+            dtype = np.dtype(dtype).newbyteorder('<')
+            if mmap:
+                points = np.memmap(path, dtype=dtype, mode='r')
+            else:
+                points = np.fromfile(path, dtype=dtype)
+            points = points.reshape(-1, 3)
+
+        if points.ndim != 2 or points.shape[1] != 3:
+            raise ValueError(f"Expected (N, 3) control points, got shape {points.shape}")
+
+        return cls(points[start:stop], lazy=lazy)
+
+    @staticmethod
+    def write_raw(path: str, points: np.ndarray, dtype: str = '<f4'):
+        """Записать контрольные точки в сырой little-endian формат для from_file"""
+        np.ascontiguousarray(points, dtype=np.dtype(dtype).newbyteorder('<')).tofile(path)
+
+    def cached(self, maxsize: int = 4096, quantum: float = 1e-6):
+        """
+        ★ Обертка с LRU-кэшем геометрии по квантованному t
+
+        Args:
+            maxsize: максимальное число запомненных значений t
+            quantum: шаг квантования t
+
+        Returns:
+            CachedCurve3D с тем же интерфейсом и cache_info()
+        """
+        from core.curve_cache import CachedCurve3D
+        return CachedCurve3D(self, maxsize=maxsize, quantum=quantum)
+
+    # ============= ЛЕНИВЫЕ ТАБЛИЦЫ =============
+
+    def _table(self, name: str):
+        """
+        Таблица name — строится при первом обращении, время пишется в build_times
+
+        В build_times — собственное время построения: таблицы, построенные
+        по пути (например, сплайн для длины дуги), из него вычитаются.
+        """
+        table = self._tables.get(name)
+        if table is None:
+            outer_nested, self._nested_build_time = self._nested_build_time, 0.0
+            start = time.perf_counter()
+            try:
+                table = getattr(self, f"_build_{name}")()
+            finally:
+                elapsed = time.perf_counter() - start
+                nested, self._nested_build_time = self._nested_build_time, outer_nested + elapsed
+            self.build_times[name] = elapsed - nested
+            self._tables[name] = table
+        return table
+
+    def precompute(self, *names: str):
+        """Построить таблицы names (по умолчанию все из TABLES)"""
+        for name in names or self.TABLES:
+            self._table(name)
+
+    def is_built(self, name: str) -> bool:
+        """Построена ли таблица name"""
+        return name in self._tables
+
+    def get_tables(self, names: Iterable[str] = None) -> dict:
+        """Уже построенные таблицы names (по умолчанию все ARRAY_TABLES)"""
+        names = self.ARRAY_TABLES if names is None else names
+        return {name: self._tables[name] for name in names if name in self._tables}
+
+    def set_tables(self, tables: dict):
+        """Подставить готовые таблицы (например, загруженные с диска) вместо построения"""
+        for name, table in tables.items():
+            self._tables[name] = tuple(table)
+
+    def _build_spline(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        ★ Один векторный сплайн вместо трех: коэффициенты хранятся
+        единым тензором (N-1, 4, 3) — старшая степень первой
+        """
+        if self.simplify_tol is None:
+            spline = CubicSpline(self.t_param, self.points, axis=0, bc_type='not-a-knot')
+            return spline.x, np.ascontiguousarray(spline.c.transpose(1, 0, 2))
+
+        # ★ Узлы — только оставленные точки, t у каждой точки прежний.
+        #   Сплайн может отойти от ломаной Дугласа–Пекера дальше допуска
+        #   (особенно на шумных данных) — тогда в каждый такой кусок
+        #   добавляется самая далекая исходная точка, и сплайн строится заново.
+        #   Каждый раунд добавляет хотя бы одну точку, в худшем случае
+        #   остаются все точки — тогда отклонение нулевое
+        kept = _douglas_peucker(np.asarray(self.points, dtype=float), self.simplify_tol)
+        while True:
+            spline = CubicSpline(self.t_param[kept], self.points[kept], axis=0, bc_type='not-a-knot')
+            breaks, coeffs = spline.x, np.ascontiguousarray(spline.c.transpose(1, 0, 2))
+            deviation = self._fit_deviation(breaks, coeffs)
+            worst = np.maximum.reduceat(deviation, kept[:-1])
+            bad = worst > self.simplify_tol
+            if not bad.any():
+                break
+            # Первая из самых далеких точек каждого плохого куска
+            piece = np.repeat(np.arange(len(kept) - 1), np.diff(kept))
+            over = np.flatnonzero(deviation[:-1] == worst[piece])
+            _, first = np.unique(piece[over], return_index=True)
+            refined = np.union1d(kept, over[first][bad[piece[over[first]]]])
+            if len(refined) == len(kept):
+                # Отклонение — только погрешность округления в узлах
+                break
+            kept = refined
+
+        self.simplify_report = {
+            'input_points': len(self.points),
+            'kept_points': len(kept),
+            'reduction_ratio': len(self.points) / len(kept),
+            'max_deviation': float(deviation.max()),
+        }
+        return breaks, coeffs
+
+    def _fit_deviation(self, breaks: np.ndarray, coeffs: np.ndarray, chunk: int = 65536) -> np.ndarray:
+        """Расстояние от сплайна до каждой исходной точки при том же t"""
+        deviation = np.empty(len(self.points))
+        for start in range(0, len(self.points), chunk):
+            t = self.t_param[start:start + chunk]
+            idx = np.clip(np.searchsorted(breaks, t, side='right') - 1, 0, len(coeffs) - 1)
+            positions = _eval_jet(coeffs[idx], t - breaks[idx], 0)[0]
+            deviation[start:start + chunk] = np.linalg.norm(positions - self.points[start:start + chunk], axis=1)
+        return deviation
+
+    def _build_arc_length(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Накопленная длина кривой
+
+        Длина каждого куска сплайна — квадратура Гаусса–Лежандра
+        от |dP/dt|; таблица накопленной длины хранится по узлам.
+        """
+        breaks, coeffs = self._table('spline')
+        piece_lengths = _piece_lengths(coeffs, np.diff(breaks))
+        return piece_lengths, np.concatenate(([0], np.cumsum(piece_lengths)))
+
+    def _build_rmf(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rotation-minimizing frame на равномерной сетке t (метод двойного отражения)
+
+        Переход от узла i к i+1 — произведение двух отражений
+        M_i = H(v2) H(v1); все M_i считаются сразу, а их префиксные
+        произведения — параллельным сканированием за log2(n) шагов.
+
+        Returns:
+            (T, U) — касательные и опорные нормали
+                     (max(RMF_SAMPLES, RMF_PER_PIECE · число кусков), 3)
+        """
+        samples = max(self.RMF_SAMPLES, self.RMF_PER_PIECE * len(self.coeffs))
+        t_grid = np.linspace(self.breaks[0], self.breaks[-1], samples)
+        frame = self.frame_bundle(t_grid, ('position', 'tangent', 'normal', 'curvature'))
+        x, T = frame.position, frame.tangent
+
+        def reflection(v):
+            # H(v) = I - 2 v vᵀ / (v·v); для v ≈ 0 — единичная матрица
+            vv = np.sum(v * v, axis=1)
+            scale = np.where(vv > 1e-20, 2.0 / np.maximum(vv, 1e-300), 0.0)
+            return np.eye(3) - scale[:, np.newaxis, np.newaxis] * v[:, :, np.newaxis] * v[:, np.newaxis, :]
+
+        H1 = reflection(x[1:] - x[:-1])
+        T_reflected = np.einsum('nij,nj->ni', H1, T[:-1])
+        M = reflection(T[1:] - T_reflected) @ H1
+
+        # Префиксные произведения P_i = M_i ... M_0 (сканирование Хиллиса–Стила)
+        step = 1
+        while step < len(M):
+            M[step:] = M[step:] @ M[:-step]
+            step *= 2
+
+        # Начальная нормаль — Frenet N, если кривизна не вырождена
+        U0 = frame.normal[0]
+        if frame.curvature[0] < 1e-8:
+            axis = np.eye(3)[np.argmin(np.abs(T[0]))]
+            U0 = np.cross(T[0], axis)
+        U0 = U0 / np.linalg.norm(U0)
+
+        U = np.empty_like(T)
+        U[0] = U0
+        U[1:] = M @ U0
+
+        # Убираем накопленный дрейф: U ⟂ T, |U| = 1
+        U -= np.sum(U * T, axis=1, keepdims=True) * T
+        U /= np.linalg.norm(U, axis=1, keepdims=True)
+        return T, U
+
+    def _build_segment_index(self) -> Tuple[cKDTree, np.ndarray, np.ndarray, float]:
+        """
+        KD-дерево по вершинам ломаной для поиска ближайшей точки
+
+        Ломаная — tessellate(INDEX_TOL), длинные отрезки дополнительно
+        делятся, чтобы ни один не был длиннее total_length / INDEX_SEGMENTS:
+        это ограничивает радиус поиска вершин в closest.
+
+        Returns:
+            (дерево, t вершин, позиции вершин, наибольшая длина отрезка)
+        """
+        t, positions = self.tessellate(tol=self.INDEX_TOL)
+
+        max_length = self.total_length / self.INDEX_SEGMENTS
+        lengths = np.linalg.norm(np.diff(positions, axis=0), axis=1)
+        pieces = np.maximum(np.ceil(lengths / max(max_length, 1e-300)), 1).astype(np.intp)
+        if pieces.max() > 1:
+            # Равномерное деление каждого отрезка [t_i, t_i+1] на pieces_i частей
+            start = np.repeat(t[:-1], pieces)
+            width = np.repeat(np.diff(t) / pieces, pieces)
+            offset = np.arange(pieces.sum()) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+            t = np.append(start + offset * width, t[-1])
+            positions = self.position(t)
+
+        max_segment = float(np.linalg.norm(np.diff(positions, axis=0), axis=1).max())
+        return cKDTree(positions), t, positions, max_segment
+
+    def _build_scalar(self) -> Tuple[list, list]:
+        """Узлы и коэффициенты как списки float — для evaluate_at без NumPy"""
+        breaks, coeffs = self._table('spline')
+        return breaks.tolist(), coeffs.reshape(len(coeffs), 12).tolist()
+
+    @property
+    def breaks(self) -> np.ndarray:
+        """Узлы сплайна (N,)"""
+        return self._table('spline')[0]
+
+    @property
+    def coeffs(self) -> np.ndarray:
+        """Коэффициенты сплайна (N-1, 4, 3)"""
+        return self._table('spline')[1]
+
+    @property
+    def piece_lengths(self) -> np.ndarray:
+        """Длина каждого куска сплайна (N-1,)"""
+        return self._table('arc_length')[0]
+
+    @property
+    def cum_lengths(self) -> np.ndarray:
+        """Накопленная длина в узлах сплайна (N,)"""
+        return self._table('arc_length')[1]
+
+    @property
+    def t_samples(self) -> np.ndarray:
+        """Значения t, соответствующие cum_lengths"""
+        return self.breaks
+
+    @property
+    def total_length(self) -> float:
+        """Полная длина кривой"""
+        return self.cum_lengths[-1]
+
+    def _locate(self, t: np.ndarray, lo: int = 0, hi: int = None) -> np.ndarray:
+        """
+        Индекс куска сплайна для каждого t (крайние куски продолжаются)
+
+        lo/hi ограничивают поиск узлами breaks[lo:hi] — для отсортированных
+        t, про которые заранее известно, в какие куски они попадают.
+        """
+        breaks = self.breaks
+        if hi is None:
+            hi = len(breaks)
+        idx = np.searchsorted(breaks[lo:hi], t, side='right') - 1 + lo
+        np.clip(idx, 0, len(self.coeffs) - 1, out=idx)
+        return idx
 
     # ============= ПОЗИЦИЯ И ПРОИЗВОДНЫЕ =============
 
+    def jet(self, t: np.ndarray, order: int = 3) -> Tuple[np.ndarray, ...]:
+        """
+        Позиция и производные до порядка order за один проход
+
+        Один поиск интервала на каждое t, затем схема Горнера
+        по общему тензору коэффициентов.
+
+        Returns:
+            (P, dP/dt, ..., d^order P/dt^order) — массивы (M, 3)
+        """
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        breaks, coeffs = self._table('spline')
+        idx = self._locate(t)
+        return _eval_jet(coeffs[idx], t - breaks[idx], order)
+
     def position(self, t: np.ndarray) -> np.ndarray:
         """Позиция P(t)"""
-        return np.column_stack([
-            self.spline_x(t),
-            self.spline_y(t),
-            self.spline_z(t)
-        ])
+        return self.jet(t, 0)[0]
 
     def velocity(self, t: np.ndarray) -> np.ndarray:
         """Первая производная dP/dt"""
-        return np.column_stack([
-            self.spline_x(t, 1),
-            self.spline_y(t, 1),
-            self.spline_z(t, 1)
-        ])
+        return self.jet(t, 1)[1]
 
     def acceleration(self, t: np.ndarray) -> np.ndarray:
         """Вторая производная d²P/dt²"""
-        return np.column_stack([
-            self.spline_x(t, 2),
-            self.spline_y(t, 2),
-            self.spline_z(t, 2)
-        ])
+        return self.jet(t, 2)[2]
 
     def jerk(self, t: np.ndarray) -> np.ndarray:
         """Третья производная d³P/dt³"""
-        return np.column_stack([
-            self.spline_x(t, 3),
-            self.spline_y(t, 3),
-            self.spline_z(t, 3)
-        ])
+        return self.jet(t, 3)[3]
+
+    def evaluate_at(self, t: float, fields: Iterable[str] = None) -> FrameBundle:
+        """
+        ★ Быстрый путь для одного t (для акторов анимации)
+
+        Горнер на float по плоским спискам коэффициентов, без
+        временных массивов NumPy. Векторы возвращаются как (3,),
+        скаляры — как float.
+
+        Args:
+            t: параметр
+            fields: нужные поля из FRAME_FIELDS (None — все)
+        """
+        fields = _check_fields(fields)
+        breaks, rows = self._table('scalar')
+
+        i = bisect.bisect_right(breaks, t) - 1
+        i = min(max(i, 0), len(rows) - 1)
+        c0x, c0y, c0z, c1x, c1y, c1z, c2x, c2y, c2z, c3x, c3y, c3z = rows[i]
+        dx = t - breaks[i]
+
+        px = ((c0x * dx + c1x) * dx + c2x) * dx + c3x
+        py = ((c0y * dx + c1y) * dx + c2y) * dx + c3y
+        pz = ((c0z * dx + c1z) * dx + c2z) * dx + c3z
+        vx = (3 * c0x * dx + 2 * c1x) * dx + c2x
+        vy = (3 * c0y * dx + 2 * c1y) * dx + c2y
+        vz = (3 * c0z * dx + 2 * c1z) * dx + c2z
+        ax = 6 * c0x * dx + 2 * c1x
+        ay = 6 * c0y * dx + 2 * c1y
+        az = 6 * c0z * dx + 2 * c1z
+
+        speed = math.sqrt(vx * vx + vy * vy + vz * vz)
+        norm = speed if speed >= 1e-10 else 1.0
+        tx, ty, tz = vx / norm, vy / norm, vz / norm
+
+        # v × a
+        cx = vy * az - vz * ay
+        cy = vz * ax - vx * az
+        cz = vx * ay - vy * ax
+        cross_norm = math.sqrt(cx * cx + cy * cy + cz * cz)
+        bx, by, bz = cx / (cross_norm + 1e-10), cy / (cross_norm + 1e-10), cz / (cross_norm + 1e-10)
+
+        curvature = cross_norm / (speed ** 3 + 1e-10)
+        torsion = 6 * (cx * c0x + cy * c0y + cz * c0z) / (cross_norm * cross_norm + 1e-10)
+
+        values = {}
+        for name in fields:
+            if name == 'position':
+                values[name] = np.array((px, py, pz))
+            elif name == 'tangent':
+                values[name] = np.array((tx, ty, tz))
+            elif name == 'binormal':
+                values[name] = np.array((bx, by, bz))
+            elif name == 'normal':
+                # N = B × T
+                values[name] = np.array((by * tz - bz * ty, bz * tx - bx * tz, bx * ty - by * tx))
+            elif name == 'curvature':
+                values[name] = curvature
+            elif name == 'radius':
+                values[name] = 1.0 / curvature if curvature > 1e-10 else math.inf
+            elif name == 'torsion':
+                values[name] = torsion
+            elif name == 'speed':
+                values[name] = speed
+        return FrameBundle(**values)
 
     # ============= ГЕОМЕТРИЯ (FRENET FRAME) =============
 
+    def frame_bundle(self, t: np.ndarray, fields: Iterable[str] = None) -> FrameBundle:
+        """
+        T, N, B, κ, τ, скорость и радиус кривизны за одно вычисление производных
+
+        Args:
+            t: параметры
+            fields: нужные поля из FRAME_FIELDS (None — все);
+                    порядок производных выбирается по полям
+        """
+        fields = _check_fields(fields)
+        return frame_from_jet(self.jet(t, _jet_order(fields)), fields)
+
+    def evaluate(self, t: np.ndarray, fields: Iterable[str] = None, workers: int = None,
+                 chunk: int = 65536, out: FrameBundle = None) -> FrameBundle:
+        """
+        ★ Вычисление по большим массивам t блоками в пуле потоков
+
+        Каждый блок считается через frame_bundle и пишется в заранее
+        выделенные выходные массивы; коэффициенты сплайна общие для
+        всех потоков (без копирования), NumPy отпускает GIL на
+        операциях с блоками.
+
+        Args:
+            t: параметры (M,)
+            fields: нужные поля из FRAME_FIELDS (None — все)
+            workers: число потоков (None — число ядер, 1 — без пула)
+            chunk: размер блока (ограничивает временную память)
+            out: готовый FrameBundle с массивами нужной формы (опционально)
+        """
+        fields = _check_fields(fields)
+        t = np.ascontiguousarray(t, dtype=float).ravel()
+        if out is None:
+            out = FrameBundle(**{name: np.empty((len(t), 3) if name in VECTOR_FIELDS else len(t))
+                                 for name in fields})
+
+        # Таблицы строятся до запуска потоков
+        self._table('spline')
+
+        def work(start: int):
+            stop = start + chunk
+            part = self.frame_bundle(t[start:stop], fields)
+            for name in fields:
+                getattr(out, name)[start:stop] = getattr(part, name)
+
+        starts = range(0, len(t), chunk)
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or len(starts) <= 1:
+            for start in starts:
+                work(start)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # list() — чтобы исключения из потоков дошли до вызывающего
+                list(pool.map(work, starts))
+        return out
+
+    def stream(self, t_start: float, t_end: float, n: int, fields: Iterable[str] = None,
+               chunk: int = 65536) -> Iterator[Tuple[np.ndarray, FrameBundle]]:
+        """
+        ★ Потоковое вычисление на n равномерных t от t_start до t_end
+
+        Отдает блоки по chunk точек, поэтому память не зависит от n.
+        t в блоке монотонны, поэтому куски сплайна не ищутся для каждой
+        точки: узлы между концами блока сливаются с t (один searchsorted
+        узлов в t и np.repeat номеров кусков) — O(chunk + кусков).
+
+        Yields:
+            (t блока, FrameBundle блока)
+        """
+        fields = _check_fields(fields)
+        order = _jet_order(fields)
+        breaks, coeffs = self._table('spline')
+        step = (t_end - t_start) / (n - 1) if n > 1 else 0.0
+
+        for start in range(0, n, chunk):
+            stop = min(start + chunk, n)
+            t = t_start + np.arange(start, stop) * step
+            if stop == n and n > 1:
+                t[-1] = t_end
+
+            # Слияние по возрастанию t: куски first..last покрывают блок
+            ascending = t if step >= 0 else t[::-1]
+            first, last = self._locate(ascending[[0, -1]])
+            bounds = np.searchsorted(ascending, breaks[first + 1:last + 1], side='left')
+            counts = np.diff(np.concatenate(([0], bounds, [len(t)])))
+            idx = np.repeat(np.arange(first, last + 1), counts)
+            if step < 0:
+                idx = idx[::-1]
+
+            derivs = _eval_jet(coeffs[idx], t - breaks[idx], order)
+            yield t, frame_from_jet(derivs, fields)
+
     def tangent(self, t: np.ndarray) -> np.ndarray:
         """Касательный вектор (нормализованный)"""
-        vel = self.velocity(t)
-        norms = np.linalg.norm(vel, axis=1, keepdims=True)
-        norms[norms < 1e-10] = 1  # избегаем деления на 0
-        return vel / norms
+        return self.frame_bundle(t, ('tangent',)).tangent
 
     def curvature(self, t: np.ndarray) -> np.ndarray:
-        """Кривизна κ(t)"""
-        vel = self.velocity(t)
-        acc = self.acceleration(t)
-
-        cross = np.cross(vel, acc)
-        cross_norm = np.linalg.norm(cross, axis=1)
-        vel_norm = np.linalg.norm(vel, axis=1)
-
-        # κ = ||dP/dt × d²P/dt²|| / ||dP/dt||³
-        curvature = cross_norm / (vel_norm ** 3 + 1e-10)
-        return curvature
+        """Кривизна κ(t) = ||dP/dt × d²P/dt²|| / ||dP/dt||³"""
+        return self.frame_bundle(t, ('curvature',)).curvature
 
     def radius_of_curvature(self, t: np.ndarray) -> np.ndarray:
         """Радиус кривизны R = 1/κ"""
-        kappa = self.curvature(t)
-        return np.where(kappa > 1e-10, 1.0 / kappa, np.inf)
+        return self.frame_bundle(t, ('radius',)).radius
 
     def frenet_frame(self, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
@@ -103,79 +753,223 @@ class Curve3D:
         N: нормаль (главная)
         B: бинормаль
         """
-        vel = self.velocity(t)
-        acc = self.acceleration(t)
+        return self.frame_bundle(t, ('tangent', 'normal', 'binormal')).frame
 
-        # Касательная T
-        T = self.tangent(t)
+    def torsion(self, t: np.ndarray) -> np.ndarray:
+        """Кручение τ(t) = (dP/dt × d²P/dt²) · d³P/dt³ / ||dP/dt × d²P/dt²||²"""
+        return self.frame_bundle(t, ('torsion',)).torsion
 
-        # dT/ds = κ * N
-        # dT/dt = (dT/ds) * (ds/dt) = κ * N * ||dP/dt||
-        # => N = (dT/dt) / (κ * ||dP/dt||)
+    # ============= УДОБНЫЕ МЕТОДЫ ДЛЯ ДОСТУПА К FRENET FRAME =============
 
-        vel_norm = np.linalg.norm(vel, axis=1, keepdims=True)
+    def normal(self, t: np.ndarray) -> np.ndarray:
+        """Главная нормаль N(t)"""
+        return self.frame_bundle(t, ('normal',)).normal
 
-        # dT/dt численно
-        dt = 1e-6
-        T_plus = self.tangent(np.clip(t + dt, 0, 1))
-        dT_dt = (T_plus - T) / dt
+    def binormal(self, t: np.ndarray) -> np.ndarray:
+        """Бинормаль B(t)"""
+        return self.frame_bundle(t, ('binormal',)).binormal
 
-        N = dT_dt / (np.linalg.norm(dT_dt, axis=1, keepdims=True) + 1e-10)
+    def tangent_vector(self, t: np.ndarray) -> np.ndarray:
+        """Касательный вектор T(t) через frenet_frame"""
+        return self.frame_bundle(t, ('tangent',)).tangent
 
-        # Бинормаль B = T × N
-        B = np.cross(T, N)
-        B = B / (np.linalg.norm(B, axis=1, keepdims=True) + 1e-10)
+    def tessellate(self, tol: float = 1e-3, initial: int = 32, max_depth: int = 24,
+                   chunk: int = 65536) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        ★ Ломаная, отклоняющаяся от кривой не больше чем на tol
 
-        return T, N, B
+        Начиная с initial равных отрезков и всех узлов сплайна, каждый
+        отрезок, у которого точки кривой в 1/4, 1/2 и 3/4 отходят от
+        хорды дальше tol, делится пополам; все отрезки уровня проверяются
+        одним вызовом. Узлы в начальной сетке гарантируют, что каждый
+        кубический кусок проверен, даже если он уже шага сетки.
+        На прямых участках вершин мало, на крутых изгибах — много.
 
-    def torsion(self, t: np.ndarray) -> np.ndarray:
-        """Кручение τ(t)"""
-        vel = self.velocity(t)
-        acc = self.acceleration(t)
-        jer = self.jerk(t)
+        Returns:
+            (t, positions) — (K,) и (K, 3)
+        """
+        breaks = self.breaks
+        t = np.union1d(np.linspace(breaks[0], breaks[-1], initial + 1), breaks)
+        positions = self.position(t)
+        probes = np.array([0.25, 0.5, 0.75])
+
+        for _ in range(max_depth):
+            # Отклонение и середина каждого отрезка — блоками, чтобы
+            # пробы на миллионах отрезков не занимали лишнюю память
+            deviation = np.empty(len(t) - 1)
+            midpoints = np.empty((len(t) - 1, 3))
+            for start in range(0, len(t) - 1, chunk):
+                stop = min(start + chunk, len(t) - 1)
+                a, b = t[start:stop], t[start + 1:stop + 1]
+                pa, pb = positions[start:stop], positions[start + 1:stop + 1]
+
+                # Расстояние от пробных точек до хорды [pa, pb]
+                samples = self.position((a[:, np.newaxis] + (b - a)[:, np.newaxis] * probes).ravel())
+                samples = samples.reshape(len(a), len(probes), 3)
+                chord = (pb - pa)[:, np.newaxis]
+                offset = samples - pa[:, np.newaxis]
+                chord_sq = np.maximum(np.sum(chord ** 2, axis=2), 1e-300)
+                s = np.clip(np.sum(offset * chord, axis=2) / chord_sq, 0, 1)
+                deviation[start:stop] = np.linalg.norm(offset - s[..., np.newaxis] * chord, axis=2).max(axis=1)
+                midpoints[start:stop] = samples[:, 1]
+
+            split = deviation > tol
+            if not split.any():
+                break
+
+            # Середины разбиваемых отрезков (они уже вычислены как проба 1/2)
+            new_t = np.concatenate((t, 0.5 * (t[:-1][split] + t[1:][split])))
+            new_positions = np.concatenate((positions, midpoints[split]))
+            order = np.argsort(new_t, kind='stable')
+            t, positions = new_t[order], new_positions[order]
+
+        return t, positions
+
+    def closest(self, points: np.ndarray, newton_steps: int = 6) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        ★ Ближайшая точка кривой для каждой точки запроса
 
-        # τ = (dP/dt × d²P/dt²) · d³P/dt³ / ||dP/dt × d²P/dt²||²
-        cross = np.cross(vel, acc)
-        cross_norm_sq = np.sum(cross ** 2, axis=1)
+        Ломаная индекса отходит от кривой не дальше INDEX_TOL, а ее отрезки
+        не длиннее max_length. Поэтому если ближайшая вершина на расстоянии
+        d, ближайший кусок кривой примыкает к вершине в радиусе
+        d + max_length / 2 + 2·INDEX_TOL — все такие вершины дает KD-дерево.
+        Из примыкающих отрезков остаются те, что ближе лучшего более чем
+        на 2·INDEX_TOL; для каждого t уточняется шагами Ньютона для
+        f(t) = (P(t) - q) · P'(t) в пределах отрезка и его соседей,
+        и выбирается ближайший результат.
 
-        torsion = np.sum(cross * jer, axis=1) / (cross_norm_sq + 1e-10)
-        return torsion
+        Args:
+            points: (M, 3) или (3,) точки запроса
 
-    # ============= УДОБНЫЕ МЕТОДЫ ДЛЯ ДОСТУПА К FRENET FRAME =============
+        Returns:
+            (t, distance) — массивы (M,)
+        """
+        tree, t_nodes, p_nodes, max_length = self._table('segment_index')
+        q = np.atleast_2d(np.asarray(points, dtype=float))
+        margin = 2 * self.INDEX_TOL
+
+        # Все вершины, к которым может примыкать ближайший кусок
+        vertex_distance, _ = tree.query(q)
+        balls = tree.query_ball_point(q, vertex_distance + 0.5 * max_length + margin)
+        counts = np.array([len(ball) for ball in balls])
+        query = np.repeat(np.arange(len(q)), counts)
+        vertex = np.concatenate([np.asarray(ball, dtype=np.intp) for ball in balls])
+
+        # Отрезки-кандидаты: [i-1, i] и [i, i+1] для каждой вершины
+        query = np.concatenate((query, query))
+        left = np.clip(np.concatenate((vertex - 1, vertex)), 0, len(t_nodes) - 2)
+        a, b = p_nodes[left], p_nodes[left + 1]
+        chord = b - a
+        offset = q[query] - a
+        u = np.clip(np.sum(offset * chord, axis=1) / np.maximum(np.sum(chord ** 2, axis=1), 1e-300), 0, 1)
+        chord_distance = np.linalg.norm(offset - u[:, np.newaxis] * chord, axis=1)
+
+        # Отбрасываем отрезки, заведомо дальше лучшего
+        nearest_chord = np.full(len(q), np.inf)
+        np.minimum.at(nearest_chord, query, chord_distance)
+        keep = chord_distance <= nearest_chord[query] + 2 * margin
+        query, segment, u = query[keep], left[keep], u[keep]
+        t = t_nodes[segment] + u * (t_nodes[segment + 1] - t_nodes[segment])
+        targets = q[query]
+
+        # Ньютон не выходит за соседние отрезки
+        t_lo = t_nodes[np.maximum(segment - 1, 0)]
+        t_hi = t_nodes[np.minimum(segment + 2, len(t_nodes) - 1)]
+
+        start_t = t
+        for _ in range(newton_steps):
+            P, dP, d2P = self.jet(t, 2)
+            diff = P - targets
+            f = np.sum(diff * dP, axis=1)
+            df = np.sum(dP * dP, axis=1) + np.sum(diff * d2P, axis=1)
+            t = np.clip(t - f / np.where(np.abs(df) > 1e-300, df, 1e-300), t_lo, t_hi)
+
+        # Ньютон мог уйти хуже начального приближения — берем лучшее
+        distance = np.linalg.norm(self.position(t) - targets, axis=1)
+        start_distance = np.linalg.norm(self.position(start_t) - targets, axis=1)
+        worse = start_distance < distance
+        t[worse] = start_t[worse]
+        distance[worse] = start_distance[worse]
+
+        # Лучший кандидат каждого запроса: первый после сортировки по (запрос, расстояние)
+        order = np.lexsort((distance, query))
+        _, first = np.unique(query[order], return_index=True)
+        winner = order[first]
+        return t[winner], distance[winner]
+
+    def rotation_minimizing_frame(self, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Rotation-minimizing frame (T, U, V) — устойчивая альтернатива Frenet
 
-    def normal(self, t: np.ndarray) -> np.ndarray:
-        """Главная нормаль N(t)"""
-        _, N, _ = self.frenet_frame(t)
-        return N
+        O(1) на точку: линейная интерполяция между соседними узлами
+        таблицы и ортонормализация, без вычисления сплайна.
+        В отличие от N и B не переворачивается там, где κ → 0.
+        """
+        T_table, U_table = self._table('rmf')
+        t = np.atleast_1d(np.asarray(t, dtype=float))
 
-    def binormal(self, t: np.ndarray) -> np.ndarray:
-        """Бинормаль B(t)"""
-        _, _, B = self.frenet_frame(t)
-        return B
+        t0, t1 = self.breaks[0], self.breaks[-1]
+        pos = np.clip((t - t0) / (t1 - t0), 0, 1) * (len(T_table) - 1)
+        i = np.minimum(pos.astype(np.intp), len(T_table) - 2)
+        w = (pos - i)[:, np.newaxis]
 
-    def tangent_vector(self, t: np.ndarray) -> np.ndarray:
-        """Касательный вектор T(t) через frenet_frame"""
-        T, _, _ = self.frenet_frame(t)
-        return T
+        T = (1 - w) * T_table[i] + w * T_table[i + 1]
+        T /= np.linalg.norm(T, axis=1, keepdims=True) + 1e-10
+        U = (1 - w) * U_table[i] + w * U_table[i + 1]
+        U -= np.sum(U * T, axis=1, keepdims=True) * T
+        U /= np.linalg.norm(U, axis=1, keepdims=True) + 1e-10
+        return T, U, np.cross(T, U)
 
     # ============= КИНЕМАТИКА =============
 
     def speed(self, t: np.ndarray) -> np.ndarray:
         """Скорость |dP/dt|"""
-        vel = self.velocity(t)
-        return np.linalg.norm(vel, axis=1)
+        return self.frame_bundle(t, ('speed',)).speed
 
     def arc_length(self, t_start: float = 0, t_end: float = 1) -> float:
         """Длина дуги от t_start до t_end"""
-        # Использует предварительно вычисленную длину
-        idx_start = np.searchsorted(self.t_samples, t_start)
-        idx_end = np.searchsorted(self.t_samples, t_end)
-        return self.cum_lengths[idx_end] - self.cum_lengths[idx_start]
+        return float(self.length_at_t(t_end) - self.length_at_t(t_start))
+
+    def length_at_t(self, t: np.ndarray) -> np.ndarray:
+        """Длина дуги s(t) от начала кривой (t прижимается к [0, 1])"""
+        t = np.clip(np.asarray(t, dtype=float), self.breaks[0], self.breaks[-1])
+        flat = np.atleast_1d(t)
+        idx = self._locate(flat)
+        lengths = self.cum_lengths[idx] + _speed_integral(self.coeffs[idx], flat - self.breaks[idx])
+        return lengths.reshape(t.shape)
+
+    def t_at_length(self, s: np.ndarray, newton_steps: int = 4) -> np.ndarray:
+        """
+        Обратное отображение t(s) — параметр по длине дуги
+
+        Кусок находится бинарным поиском по накопленной длине (O(log n)),
+        внутри куска — несколько шагов Ньютона (ds/dt = |dP/dt|).
+        s вне [0, total_length] прижимается к концам.
+        """
+        s = np.clip(np.asarray(s, dtype=float), 0, self.total_length)
+        flat = np.atleast_1d(s)
+
+        idx = np.searchsorted(self.cum_lengths, flat, side='right') - 1
+        np.clip(idx, 0, len(self.coeffs) - 1, out=idx)
+        left = self.breaks[idx]
+        right = self.breaks[idx + 1]
+        c = self.coeffs[idx]
+        target = flat - self.cum_lengths[idx]
+
+        # Начальное приближение — линейно внутри куска
+        fraction = target / np.maximum(self.piece_lengths[idx], 1e-300)
+        t = left + np.clip(fraction, 0, 1) * (right - left)
+
+        for _ in range(newton_steps):
+            error = _speed_integral(c, t - left) - target
+            speed = np.linalg.norm(_eval_jet(c, t - left, 1)[1], axis=1)
+            t = np.clip(t - error / np.maximum(speed, 1e-12), left, right)
+
+        return t.reshape(s.shape)
 
     def angular_velocity(self, t: np.ndarray) -> np.ndarray:
         """Угловая скорость ω = (dP/dt × d²P/dt²) / ||dP/dt||²"""
-        vel = self.velocity(t)
-        acc = self.acceleration(t)
+        _, vel, acc = self.jet(t, 2)
 
         cross = np.cross(vel, acc)
         vel_norm_sq = np.sum(vel ** 2, axis=1, keepdims=True)
@@ -184,8 +978,7 @@ class Curve3D:
 
     def tangential_acceleration(self, t: np.ndarray) -> np.ndarray:
         """Тангенциальное ускорение a_t = (dP/dt · d²P/dt²) / ||dP/dt||"""
-        vel = self.velocity(t)
-        acc = self.acceleration(t)
+        _, vel, acc = self.jet(t, 2)
 
         vel_norm = np.linalg.norm(vel, axis=1)
         a_t = np.sum(vel * acc, axis=1) / (vel_norm + 1e-10)
@@ -194,8 +987,7 @@ class Curve3D:
 
     def normal_acceleration(self, t: np.ndarray) -> np.ndarray:
         """Нормальное ускорение a_n = ||dP/dt × d²P/dt²|| / ||dP/dt||²"""
-        vel = self.velocity(t)
-        acc = self.acceleration(t)
+        _, vel, acc = self.jet(t, 2)
 
         cross = np.cross(vel, acc)
         cross_norm = np.linalg.norm(cross, axis=1)
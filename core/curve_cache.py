@@ -0,0 +1,159 @@
+import numpy as np
+from collections import OrderedDict, namedtuple
+from typing import Iterable, Tuple
+from core.curve import Curve3D, FrameBundle, FRAME_FIELDS, _check_fields, frame_from_jet
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# Раскладка строки кэша: P, dP, d²P, d³P, T, N, B, κ, τ, |dP|, R
+_JET_SLICES = (slice(0, 3), slice(3, 6), slice(6, 9), slice(9, 12))
+_FIELD_SLICES = {
+    'position': slice(0, 3),
+    'tangent': slice(12, 15),
+    'normal': slice(15, 18),
+    'binormal': slice(18, 21),
+    'curvature': 21,
+    'torsion': 22,
+    'speed': 23,
+    'radius': 24,
+}
+_ROW_SIZE = 25
+
+
+class CachedCurve3D:
+    """
+    Curve3D с LRU-кэшем геометрии по квантованному t
+
+    t округляется до кратного quantum, и все величины (позиция,
+    производные, Frenet frame, κ, τ) вычисляются в этой точке
+    один раз. Остальные атрибуты берутся у исходной кривой.
+    """
+
+    def __init__(self, curve: Curve3D, maxsize: int = 4096, quantum: float = 1e-6):
+        """
+        Args:
+            curve: исходная кривая
+            maxsize: максимальное число запомненных значений t
+            quantum: шаг квантования t
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if quantum <= 0:
+            raise ValueError("quantum must be positive")
+
+        self.curve = curve
+        self.maxsize = maxsize
+        self.quantum = quantum
+
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __getattr__(self, name):
+        # Все, что не кэшируется (arc_length, total_length, ...), — у исходной кривой
+        return getattr(self.curve, name)
+
+    # ============= КЭШ =============
+
+    def _evaluate_rows(self, t: np.ndarray) -> np.ndarray:
+        """Вычислить строки кэша (M, 25) для точек t"""
+        derivs = self.curve.jet(t, 3)
+        bundle = frame_from_jet(derivs, FRAME_FIELDS)
+
+        rows = np.empty((len(t), _ROW_SIZE))
+        for part, cols in zip(derivs, _JET_SLICES):
+            rows[:, cols] = part
+        for name, cols in _FIELD_SLICES.items():
+            if name != 'position':
+                rows[:, cols] = getattr(bundle, name)
+        return rows
+
+    def _lookup(self, t: np.ndarray) -> np.ndarray:
+        """Строки кэша для t; промахи вычисляются одним векторным вызовом"""
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        keys = np.rint(t / self.quantum).astype(np.int64)
+
+        # Запрос больше кэша все равно вытеснит сам себя — считаем напрямую
+        # (в статистике это промахи)
+        if len(keys) > self.maxsize:
+            self.misses += len(keys)
+            return self._evaluate_rows(keys * self.quantum)
+
+        rows = np.empty((len(keys), _ROW_SIZE))
+        missing = []
+        for i, key in enumerate(keys.tolist()):
+            row = self._entries.get(key)
+            if row is None:
+                missing.append(i)
+            else:
+                self._entries.move_to_end(key)
+                rows[i] = row
+        self.hits += len(keys) - len(missing)
+
+        if missing:
+            self.misses += len(missing)
+            fresh = self._evaluate_rows(keys[missing] * self.quantum)
+            rows[missing] = fresh
+            for key, row in zip(keys[missing].tolist(), fresh):
+                self._entries[key] = row.copy()
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return rows
+
+    def cache_info(self) -> CacheInfo:
+        """Статистика кэша (как у functools.lru_cache)"""
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def cache_clear(self):
+        """Очистить кэш и статистику"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    # ============= ЗАПРОСЫ ЧЕРЕЗ КЭШ =============
+
+    def jet(self, t: np.ndarray, order: int = 3) -> Tuple[np.ndarray, ...]:
+        """Позиция и производные до порядка order (см. Curve3D.jet)"""
+        rows = self._lookup(t)
+        return tuple(np.ascontiguousarray(rows[:, cols]) for cols in _JET_SLICES[:order + 1])
+
+    def frame_bundle(self, t: np.ndarray, fields: Iterable[str] = None) -> FrameBundle:
+        """Frenet frame и связанные величины (см. Curve3D.frame_bundle)"""
+        fields = _check_fields(fields)
+        rows = self._lookup(t)
+        return FrameBundle(**{name: np.ascontiguousarray(rows[:, _FIELD_SLICES[name]])
+                              for name in fields})
+
+    def evaluate_at(self, t: float, fields: Iterable[str] = None) -> FrameBundle:
+        """Быстрый путь для одного t (см. Curve3D.evaluate_at)"""
+        fields = _check_fields(fields)
+        row = self._lookup(t)[0]
+        return FrameBundle(**{name: (row[cols].copy() if isinstance(cols, slice) else float(row[cols]))
+                              for name, cols in ((name, _FIELD_SLICES[name]) for name in fields)})
+
+    # Геометрия Curve3D выражена через jet/frame_bundle,
+    # поэтому те же методы работают поверх кэша
+    position = Curve3D.position
+    velocity = Curve3D.velocity
+    acceleration = Curve3D.acceleration
+    jerk = Curve3D.jerk
+    tangent = Curve3D.tangent
+    curvature = Curve3D.curvature
+    radius_of_curvature = Curve3D.radius_of_curvature
+    frenet_frame = Curve3D.frenet_frame
+    torsion = Curve3D.torsion
+    normal = Curve3D.normal
+    binormal = Curve3D.binormal
+    tangent_vector = Curve3D.tangent_vector
+    speed = Curve3D.speed
+    angular_velocity = Curve3D.angular_velocity
+    tangential_acceleration = Curve3D.tangential_acceleration
+    normal_acceleration = Curve3D.normal_acceleration
+
+    def __repr__(self):
+        info = self.cache_info()
+        return (f"CachedCurve3D(hits={info.hits}, misses={info.misses}, "
+                f"size={info.currsize}/{info.maxsize}, quantum={self.quantum})")
@@ -0,0 +1,180 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+from typing import Iterable
+from core.curve import Curve3D
+from core.sampler import CurveSampler
+
+
+class CurveDiskCache:
+    """
+    Кэш построенных кривых на диске
+
+    Ключ — хэш контрольных точек и параметров построения. Для ключа
+    хранятся таблицы Curve3D (коэффициенты сплайна, длины дуги, ...)
+    и, по желанию, таблицы CurveSampler — каждая в своем .npy.
+    Повторный запуск открывает их через np.load(mmap_mode='r') вместо
+    построения. Если кэш больше max_bytes, удаляются давно не
+    использованные записи.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30):
+        """
+        Args:
+            directory: каталог кэша (создается при необходимости)
+            max_bytes: предельный размер кэша в байтах
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    # ============= КЛЮЧИ =============
+
+    @staticmethod
+    def key(points: np.ndarray, **options) -> str:
+        """Хэш контрольных точек и параметров построения"""
+        points = np.ascontiguousarray(points)
+        digest = hashlib.sha256()
+        digest.update(str((points.dtype.str, points.shape)).encode())
+        digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+        digest.update(memoryview(points).cast('B'))
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    # ============= КРИВЫЕ =============
+
+    def load_or_fit(self, points: np.ndarray, tables: Iterable[str] = ('spline', 'arc_length'),
+                    **options) -> Curve3D:
+        """
+        ★ Кривая из кэша или построенная заново (и сохраненная)
+
+        Args:
+            points: (N, 3) контрольные точки
+            tables: какие таблицы Curve3D хранить (из ARRAY_TABLES)
+            options: параметры Curve3D (входят в ключ)
+        """
+        curve, hit = self._load_or_fit(points, tables, options)
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return curve
+
+    def _load_or_fit(self, points: np.ndarray, tables: Iterable[str], options: dict):
+        """(кривая, найдена ли в кэше) — без счетчиков hits/misses"""
+        key = self.key(points, **options)
+        curve = Curve3D(points, lazy=True, **options)
+
+        loaded = self._load_arrays(key, 'curve')
+        if loaded is not None and all(name in loaded for name in tables):
+            curve.set_tables(loaded)
+            return curve, True
+
+        curve.precompute(*tables)
+        self._store_arrays(key, 'curve', curve.get_tables(tables))
+        return curve, False
+
+    def load_or_build_sampler(self, points: np.ndarray, resolution: int = 1024,
+                              **options) -> CurveSampler:
+        """CurveSampler из кэша или построенный заново (ключ — точки, параметры и resolution)"""
+        key = self.key(points, **options)
+        group = f"sampler_{resolution}"
+
+        loaded = self._load_arrays(key, group)
+        if loaded is not None:
+            self.hits += 1
+            (t_range,) = loaded.pop('t_range')
+            return CurveSampler.from_arrays(t_range[0], t_range[1],
+                                            {name: value[0] for name, value in loaded.items()})
+
+        # Промах считается один раз — за сэмплер, а не за кривую под ним
+        self.misses += 1
+        curve, _ = self._load_or_fit(points, ('spline', 'arc_length'), options)
+        sampler = CurveSampler(curve, resolution)
+        arrays = {name: (getattr(sampler, name),) for name in CurveSampler.FIELDS}
+        arrays['t_range'] = (np.array([sampler.t_min, sampler.t_max]),)
+        self._store_arrays(key, group, arrays)
+        return sampler
+
+    # ============= ХРАНЕНИЕ =============
+
+    def _load_arrays(self, key: str, group: str):
+        """{имя таблицы: кортеж массивов (mmap)} группы group или None"""
+        path = os.path.join(self._entry(key), group)
+        manifest = os.path.join(path, 'manifest.json')
+        if not os.path.exists(manifest):
+            return None
+
+        with open(manifest) as f:
+            layout = json.load(f)
+        tables = {name: tuple(np.load(os.path.join(path, f"{name}_{i}.npy"), mmap_mode='r')
+                              for i in range(count))
+                  for name, count in layout.items()}
+
+        # Время использования записи — для вытеснения
+        os.utime(self._entry(key))
+        return tables
+
+    def _store_arrays(self, key: str, group: str, tables: dict):
+        """Атомарно записать таблицы группы group и подрезать кэш"""
+        entry = self._entry(key)
+        os.makedirs(entry, exist_ok=True)
+
+        # Пишем во временный каталог и переименовываем — без полузаписанных групп
+        staging = tempfile.mkdtemp(dir=entry)
+        for name, arrays in tables.items():
+            for i, array in enumerate(arrays):
+                np.save(os.path.join(staging, f"{name}_{i}.npy"), array)
+        with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+            json.dump({name: len(arrays) for name, arrays in tables.items()}, f)
+
+        target = os.path.join(entry, group)
+        shutil.rmtree(target, ignore_errors=True)
+        os.replace(staging, target)
+        os.utime(entry)
+
+        self.evict(keep=key)
+
+    @staticmethod
+    def _size(path: str) -> int:
+        total = 0
+        for root, _, files in os.walk(path):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+        return total
+
+    def size(self) -> int:
+        """Текущий размер кэша в байтах"""
+        return self._size(self.directory)
+
+    def evict(self, keep: str = None):
+        """Удалять давно не использованные записи, пока кэш больше max_bytes"""
+        entries = []
+        for key in os.listdir(self.directory):
+            path = self._entry(key)
+            if os.path.isdir(path):
+                entries.append((os.path.getmtime(path), key, self._size(path)))
+
+        total = sum(size for _, _, size in entries)
+        for _, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        """Удалить все записи"""
+        for key in os.listdir(self.directory):
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+
+    def __repr__(self):
+        return (f"CurveDiskCache({self.directory!r}, {self.size() / 1e6:.1f}/{self.max_bytes / 1e6:.1f} MB, "
+                f"hits={self.hits}, misses={self.misses})")
@@ -0,0 +1,114 @@
+import numpy as np
+from typing import Dict
+from core.curve import Curve3D, FrameBundle, VECTOR_FIELDS
+
+
+class CurveSampler:
+    """
+    Плотная таблица геометрии кривой для проигрывания анимации
+
+    Позиция, T, N, B, κ, τ и радиус кривизны один раз вычисляются
+    на равномерной сетке t и хранятся в непрерывных float32 массивах
+    (вдвое меньше памяти, чем float64). Запросы — по индексу или
+    с линейной интерполяцией, без вычисления сплайна.
+    """
+
+    FIELDS = ('position', 'tangent', 'normal', 'binormal', 'curvature', 'torsion', 'radius')
+
+    def __init__(self, curve: Curve3D, resolution: int = 1024):
+        """
+        Args:
+            curve: исходная кривая
+            resolution: число узлов таблицы
+        """
+        if resolution < 2:
+            raise ValueError("resolution must be at least 2")
+
+        t_min, t_max = float(curve.breaks[0]), float(curve.breaks[-1])
+        bundle = curve.evaluate(np.linspace(t_min, t_max, resolution), self.FIELDS)
+        self._set_arrays(t_min, t_max, {name: getattr(bundle, name) for name in self.FIELDS})
+
+    @classmethod
+    def from_arrays(cls, t_min: float, t_max: float, arrays: Dict[str, np.ndarray]) -> "CurveSampler":
+        """Собрать таблицу из готовых массивов (например, загруженных с диска)"""
+        sampler = cls.__new__(cls)
+        sampler._set_arrays(t_min, t_max, arrays)
+        return sampler
+
+    def _set_arrays(self, t_min: float, t_max: float, arrays: Dict[str, np.ndarray]):
+        self.t_min = float(t_min)
+        self.t_max = float(t_max)
+        for name in self.FIELDS:
+            setattr(self, name, np.ascontiguousarray(arrays[name], dtype=np.float32))
+        self.resolution = len(self.position)
+
+    def __len__(self):
+        return self.resolution
+
+    @property
+    def nbytes(self) -> int:
+        """Память под все таблицы в байтах"""
+        return sum(getattr(self, name).nbytes for name in self.FIELDS)
+
+    @property
+    def t_values(self) -> np.ndarray:
+        """Значения t узлов таблицы"""
+        return np.linspace(self.t_min, self.t_max, self.resolution)
+
+    # ============= ЗАПРОСЫ =============
+
+    def index(self, t: np.ndarray) -> np.ndarray:
+        """Ближайший узел таблицы для t"""
+        pos = (np.asarray(t, dtype=float) - self.t_min) / (self.t_max - self.t_min) * (self.resolution - 1)
+        return np.clip(np.rint(pos), 0, self.resolution - 1).astype(np.intp)
+
+    def at_index(self, i) -> FrameBundle:
+        """Значения в узле (узлах) i без интерполяции"""
+        return FrameBundle(**{name: getattr(self, name)[i] for name in self.FIELDS})
+
+    def lookup(self, t: np.ndarray) -> FrameBundle:
+        """Значения в ближайшем узле для t"""
+        return self.at_index(self.index(t))
+
+    def interpolate(self, t: np.ndarray) -> FrameBundle:
+        """
+        Линейная интерполяция между соседними узлами
+
+        T, N, B после интерполяции нормализуются, радиус
+        пересчитывается из интерполированной кривизны.
+        """
+        t = np.atleast_1d(np.asarray(t, dtype=float))
+        pos = np.clip((t - self.t_min) / (self.t_max - self.t_min), 0, 1) * (self.resolution - 1)
+        i = np.minimum(pos.astype(np.intp), self.resolution - 2)
+        w = (pos - i).astype(np.float32)
+
+        values = {}
+        for name in self.FIELDS[:-1]:
+            table = getattr(self, name)
+            weight = w[:, np.newaxis] if name in VECTOR_FIELDS else w
+            values[name] = table[i] + weight * (table[i + 1] - table[i])
+
+        for name in ('tangent', 'normal', 'binormal'):
+            values[name] /= np.linalg.norm(values[name], axis=1, keepdims=True) + np.float32(1e-10)
+
+        curvature = values['curvature']
+        with np.errstate(divide='ignore'):
+            values['radius'] = np.where(curvature > 1e-10, 1.0 / curvature, np.inf).astype(np.float32)
+        return FrameBundle(**values)
+
+    # ============= СОХРАНЕНИЕ =============
+
+    def save(self, path: str):
+        """Сохранить таблицу в .npz"""
+        np.savez(path, t_range=np.array([self.t_min, self.t_max]),
+                 **{name: getattr(self, name) for name in self.FIELDS})
+
+    @classmethod
+    def load(cls, path: str) -> "CurveSampler":
+        """Загрузить таблицу, сохраненную через save()"""
+        with np.load(path) as data:
+            t_min, t_max = data['t_range']
+            return cls.from_arrays(t_min, t_max, {name: data[name] for name in cls.FIELDS})
+
+    def __repr__(self):
+        return f"CurveSampler(resolution={self.resolution}, t=[{self.t_min}, {self.t_max}], {self.nbytes / 1e6:.2f} MB)"
@@ -1,6 +1,7 @@
 import numpy as np
 import pyvista as pv
 from core.curve import Curve3D
+from visualization.picking import CurvePicker, trajectory_mesh
 
 
 def visualize_curve_with_frenet_frame(curve, num_frames: int = 12, scale: float = 0.3):
@@ -20,17 +21,21 @@ def visualize_curve_with_frenet_frame(curve, num_frames: int = 12, scale: float
     plotter.set_background("black")
 
     # Рисуем кривую
-    t_values = np.linspace(0, 1, 300)
-    positions = curve.position(t_values)
-    plotter.add_mesh(
-        pv.lines_from_points(positions),
+    trajectory_t, positions = curve.tessellate(tol=1e-3)
+    trajectory = trajectory_mesh(trajectory_t, positions)
+    trajectory_actor = plotter.add_mesh(
+        trajectory,
         color="yellow",
         line_width=1,
         label="Кривая"
     )
 
+    # Клик по кривой — t, s, κ, τ и R в этой точке
+    CurvePicker(curve, trajectory, trajectory_actor).attach(plotter)
+
     # Рисуем эволюту
     evolute_points = []
+    t_values = np.linspace(0, 1, 300)
     for t in t_values:
         position = curve.position(np.array([t]))[0]
         radius = curve.radius_of_curvature(np.array([t]))[0]
@@ -40,8 +40,7 @@ class SimpleAnimation:
         self.plotter.set_background("black")
 
         # Добавляем траекторию
-        t_values = np.linspace(0, 1, 300)
-        positions = self.curve.position(t_values)
+        _, positions = self.curve.tessellate(tol=1e-3)
         self.plotter.add_mesh(
             pv.lines_from_points(positions),
             color="yellow",
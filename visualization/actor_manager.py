@@ -1,5 +1,6 @@
 from typing import List, Dict
 import numpy as np
+from visualization.frame_context import FrameContext
 
 
 class ActorManager:
@@ -43,9 +44,19 @@ class ActorManager:
             self._actor_dict[actor_type].remove(actor)
 
     def update_all(self, plotter, t: float):
-        """Обновить все акторы"""
+        """
+        Обновить все акторы
+
+        ★ Для каждой кривой создается один FrameContext на кадр,
+        поэтому акторы на одной кривой делят одно вычисление
+        """
+        contexts: Dict[int, FrameContext] = {}
         for actor in self.actors:
-            actor.update(plotter, t)
+            curve = actor.curve
+            ctx = contexts.get(id(curve))
+            if ctx is None:
+                ctx = contexts[id(curve)] = FrameContext(curve, t)
+            actor.update(plotter, ctx)
 
     def get_by_type(self, actor_type: str):
         """Получить акторы по типу"""
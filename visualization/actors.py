@@ -1,47 +1,47 @@
 # visualization/actors.py
 import numpy as np
 import pyvista as pv
-from visualization.base_actor import BaseActor
+from visualization.base_actor import ArrowGlyphActor, BaseActor
+from visualization.frame_context import FrameContext
 
 
-class ArrowActor(BaseActor):
+class ArrowActor(ArrowGlyphActor):
     """Стрелка на кривой (касательная, нормаль, бинормаль)"""
 
+    _FRAME_AXES = ("tangent", "normal", "binormal")
+
     def __init__(self, curve, arrow_type: str = "tangent", scale: float = 0.3,
-                 color: str = "white", smoothing: float = 0.0):
+                 color: str = "white", smoothing: float = 0.0, frame: str = "frenet"):
+        """
+        Args:
+            curve: объект Curve3D
+            arrow_type: "tangent", "normal" или "binormal"
+            scale: длина стрелки
+            color: цвет стрелки
+            smoothing: коэффициент сглаживания
+            frame: "frenet" — Frenet frame (T, N, B)
+                   "rmf" — rotation-minimizing frame (T, U, V): не
+                   переворачивается при κ → 0, сглаживание не нужно
+        """
         super().__init__(curve, color, smoothing)
         self.arrow_type = arrow_type
         self.scale = scale
-        self._direction_func = self._get_direction_func()
-
-    def _get_direction_func(self):
-        methods = {
-            "tangent": self.curve.tangent,
-            "normal": self.curve.normal,
-            "binormal": self.curve.binormal,
-        }
-        method = methods.get(self.arrow_type)
-        if method is None:
+        self.frame = frame
+        if self.arrow_type not in self._FRAME_AXES:
             raise ValueError(f"Unknown arrow_type: {self.arrow_type}")
-        return method
+        if self.frame not in ("frenet", "rmf"):
+            raise ValueError(f"Unknown frame: {self.frame}")
 
-    def _compute_geometry(self, t: float) -> tuple:
-        position = self.curve.position(np.array([t]))[0]
-        direction = self._direction_func(np.array([t]))[0]
+    def _compute_geometry(self, ctx: FrameContext) -> tuple:
+        if self.frame == "rmf":
+            direction = ctx.rmf[self._FRAME_AXES.index(self.arrow_type)]
+        else:
+            direction = ctx.get(self.arrow_type)
         direction = direction / (np.linalg.norm(direction) + 1e-10) * self.scale
-        return position, direction
-
-    def _create_mesh_geometry(self, position: np.ndarray, direction: np.ndarray):
-        """★ Создает меш БЕЗ добавления в plotter"""
-        return pv.Arrow(start=position, direction=direction, scale=0.1)
-
-    def _create_mesh(self, position: np.ndarray, direction: np.ndarray, plotter):
-        """★ Создает и добавляет меш в plotter (первый раз)"""
-        arrow = self._create_mesh_geometry(position, direction)
-        return plotter.add_mesh(arrow, color=self.color)
+        return ctx.position, direction
 
 
-class CurvatureActor(BaseActor):
+class CurvatureActor(ArrowGlyphActor):
     """Стрелка кривизны"""
 
     arrow_type = "curvature"
@@ -50,25 +50,12 @@ class CurvatureActor(BaseActor):
         super().__init__(curve, color, smoothing)
         self.scale = scale
 
-    def _compute_geometry(self, t: float) -> tuple:
-        position = self.curve.position(np.array([t]))[0]
-        curvature = self.curve.curvature(np.array([t]))[0]
-        _, normal, _ = self.curve.frenet_frame(np.array([t]))
-        normal = normal[0]
-        direction = normal * curvature * self.scale
-        return position, direction
-
-    def _create_mesh_geometry(self, position: np.ndarray, direction: np.ndarray):
-        """★ Создает меш БЕЗ добавления в plotter"""
-        return pv.Arrow(start=position, direction=direction, scale=0.1)
-
-    def _create_mesh(self, position: np.ndarray, direction: np.ndarray, plotter):
-        """★ Создает и добавляет меш в plotter (первый раз)"""
-        arrow = self._create_mesh_geometry(position, direction)
-        return plotter.add_mesh(arrow, color=self.color)
+    def _compute_geometry(self, ctx: FrameContext) -> tuple:
+        direction = ctx.normal * ctx.curvature * self.scale
+        return ctx.position, direction
 
 
-class TorsionActor(BaseActor):
+class TorsionActor(ArrowGlyphActor):
     """Стрелка кручения"""
 
     arrow_type = "torsion"
@@ -77,47 +64,25 @@ class TorsionActor(BaseActor):
         super().__init__(curve, color, smoothing)
         self.scale = scale
 
-    def _compute_geometry(self, t: float) -> tuple:
-        position = self.curve.position(np.array([t]))[0]
-        torsion = self.curve.torsion(np.array([t]))[0]
-        _, _, binormal = self.curve.frenet_frame(np.array([t]))
-        binormal = binormal[0]
-        direction = binormal * abs(torsion) * self.scale
-        return position, direction
-
-    def _create_mesh_geometry(self, position: np.ndarray, direction: np.ndarray):
-        """★ Создает меш БЕЗ добавления в plotter"""
-        return pv.Arrow(start=position, direction=direction, scale=0.1)
-
-    def _create_mesh(self, position: np.ndarray, direction: np.ndarray, plotter):
-        """★ Создает и добавляет меш в plotter (первый раз)"""
-        arrow = self._create_mesh_geometry(position, direction)
-        return plotter.add_mesh(arrow, color=self.color)
+    def _compute_geometry(self, ctx: FrameContext) -> tuple:
+        direction = ctx.binormal * abs(ctx.torsion) * self.scale
+        return ctx.position, direction
 
 
-class SpeedActor(BaseActor):
+class SpeedActor(ArrowGlyphActor):
     """Стрелка скорости"""
 
     arrow_type = "speed"
+    glyph_scale = 0.08
 
     def __init__(self, curve, scale: float = 0.3, color: str = "lime", smoothing: float = 0.0):
         super().__init__(curve, color, smoothing)
         self.scale = scale
 
-    def _compute_geometry(self, t: float) -> tuple:
-        position = self.curve.position(np.array([t]))[0]
-        velocity = self.curve.velocity(np.array([t]))[0]
+    def _compute_geometry(self, ctx: FrameContext) -> tuple:
+        velocity = ctx.velocity
         direction = velocity / (np.linalg.norm(velocity) + 1e-10) * self.scale
-        return position, direction
-
-    def _create_mesh_geometry(self, position: np.ndarray, direction: np.ndarray):
-        """★ Создает меш БЕЗ добавления в plotter"""
-        return pv.Arrow(start=position, direction=direction, scale=0.08)
-
-    def _create_mesh(self, position: np.ndarray, direction: np.ndarray, plotter):
-        """★ Создает и добавляет меш в plotter (первый раз)"""
-        arrow = self._create_mesh_geometry(position, direction)
-        return plotter.add_mesh(arrow, color=self.color)
+        return ctx.position, direction
 
 
 class RadiusOfCurvatureActor(BaseActor):
@@ -126,37 +91,48 @@ class RadiusOfCurvatureActor(BaseActor):
     arrow_type = "radius_of_curvature"
 
     def __init__(self, curve, scale: float = 1.0, color: str = "cyan",
-                 opacity: float = 0.3, smoothing: float = 0.0):
+                 opacity: float = 0.3, smoothing: float = 0.0, resolution: int = 32):
+        """
+        Args:
+            curve: объект Curve3D
+            scale: множитель радиуса
+            color: цвет окружности
+            opacity: прозрачность (0-1)
+            smoothing: коэффициент сглаживания
+            resolution: число точек окружности
+        """
         super().__init__(curve, color, smoothing)
 
         self.scale = scale
         self.opacity = opacity
+        self.resolution = resolution
         self._last_radius = None
         self._last_normal = None
         self._last_binormal = None
 
-    def _compute_geometry(self, t: float) -> tuple:
+        # ★ Шаблон единичной окружности (cos, sin), замкнутый: последняя
+        #   точка совпадает с первой
+        angles = np.linspace(0, 2 * np.pi, resolution + 1)
+        self._template = np.column_stack((np.cos(angles), np.sin(angles)))
+        self._mesh = None
+
+    def _compute_geometry(self, ctx: FrameContext) -> tuple:
         """Вычислить параметры окружности"""
-        position = self.curve.position(np.array([t]))[0]
-        radius = self.curve.radius_of_curvature(np.array([t]))[0]
+        radius = ctx.radius
 
         if np.isinf(radius) or radius > 100:
             radius = 10
         radius *= self.scale
 
-        _, normal, binormal = self.curve.frenet_frame(np.array([t]))
-        normal = normal[0]
-        binormal = binormal[0]
-
-        return (position, (radius, normal, binormal))
+        return (ctx.position, (radius, ctx.normal, ctx.binormal))
 
     def _create_mesh(self, position: np.ndarray, direction: np.ndarray, plotter):
         """Dummy метод (не используется, переопределяем update)"""
         return None
 
-    def update(self, plotter, t: float):
+    def update(self, plotter, t):
         """Переопределяем update для окружности"""
-        position, (radius, normal, binormal) = self._compute_geometry(t)
+        position, (radius, normal, binormal) = self._compute_geometry(FrameContext.ensure(self.curve, t))
 
         # ★ Сглаживаем радиус
         if self._last_radius is None:
@@ -178,34 +154,21 @@ class RadiusOfCurvatureActor(BaseActor):
         # Центр окружности
         center = position + normal * radius
 
-        # Генерируем точки окружности
-        angles = np.linspace(0, 2 * np.pi, 32)
-        circle_points = np.zeros((len(angles), 3))
+        # ★ Точки окружности — одно аффинное преобразование шаблона
+        circle_points = center + self._template @ (radius * np.vstack((normal, binormal)))
 
-        for i, angle in enumerate(angles):
-            circle_points[i] = (
-                    center +
-                    radius * np.cos(angle) * normal +
-                    radius * np.sin(angle) * binormal
+        if self._mesh is None:
+            self._mesh = pv.lines_from_points(circle_points)
+            self._actor = plotter.add_mesh(
+                self._mesh,
+                color=self.color,
+                line_width=2,
+                opacity=self.opacity
             )
-
-        circle_points = np.vstack([circle_points, circle_points[0]])
-
-        # ★ Удаляем старый актор
-        if self._actor is not None:
-            try:
-                plotter.remove_actor(self._actor)
-            except:
-                pass
-
-        # ★ Создаем новый
-        mesh = pv.lines_from_points(circle_points)
-        self._actor = plotter.add_mesh(
-            mesh,
-            color=self.color,
-            line_width=2,
-            opacity=self.opacity
-        )
+        else:
+            # ★ Меш тот же — переписываем только координаты точек
+            self._mesh.points[:] = circle_points
+            self._mesh.Modified()
 
 
 class EvoluteActor(BaseActor):
@@ -214,7 +177,7 @@ class EvoluteActor(BaseActor):
     arrow_type = "evolute"
 
     def __init__(self, curve, color: str = "purple", line_width: int = 2,
-                 opacity: float = 0.8, smoothing: float = 0.0):
+                 opacity: float = 0.8, smoothing: float = 0.0, resolution: int = 150):
         """
         Args:
             curve: объект Curve3D
@@ -222,45 +185,69 @@ class EvoluteActor(BaseActor):
             line_width: толщина линии
             opacity: прозрачность (0-1)
             smoothing: коэффициент сглаживания
+            resolution: число точек эволюты на всем интервале t ∈ [0, 1]
         """
         super().__init__(curve, color, smoothing)
         self.line_width = line_width
         self.opacity = opacity
+        self.resolution = resolution
         self._evolute_actor = None
+        self._mesh = None
+        self._t_values = None
+        self._offsets = None
+        self._visible = None
 
-    def _compute_geometry(self, t: float) -> tuple:
+    def _compute_geometry(self, ctx: FrameContext) -> tuple:
         return (None, None)
 
     def _create_mesh(self, position, direction, plotter):
         return None
 
-    def update(self, plotter, t: float):
-        """Рисует эволюту от 0 до текущей точки t"""
-        # ★ Генерируем точки эволюты только ДО текущей точки t
-        t_values = np.linspace(0, t, max(2, int(150 * t)))  # ← Важно!
-        positions = self.curve.position(t_values)
-        radii = self.curve.radius_of_curvature(t_values)
-
-        # Получаем Frenet frame для каждой точки
-        _, normals, _ = self.curve.frenet_frame(t_values)
+    def _build(self, plotter):
+        """
+        ★ Эволюта считается один раз на всем интервале и хранится одной
+        ломаной; в кадре меняется только число ее видимых точек
+        """
+        t_values = np.linspace(0, 1, max(2, self.resolution))
+        # Позиция, нормаль и радиус — одним вычислением производных
+        frame = self.curve.frame_bundle(t_values, ("position", "normal", "radius"))
 
         # Центры кривизны
-        evolute_points = positions + normals * radii[:, np.newaxis]
+        evolute_points = frame.position + frame.normal * frame.radius[:, np.newaxis]
 
         # Удаляем бесконечности
-        evolute_points = evolute_points[np.isfinite(evolute_points).all(axis=1)]
-
-        if len(evolute_points) > 1:
-            if self._evolute_actor is not None:
-                try:
-                    plotter.remove_actor(self._evolute_actor)
-                except:
-                    pass
-
-            mesh = pv.lines_from_points(evolute_points)
-            self._evolute_actor = plotter.add_mesh(
-                mesh,
-                color=self.color,
-                line_width=self.line_width,
-                opacity=self.opacity
-            )
\ No newline at end of file
+        finite = np.isfinite(evolute_points).all(axis=1)
+        self._t_values = t_values[finite]
+        evolute_points = evolute_points[finite]
+
+        n = len(evolute_points)
+        mesh = pv.PolyData(evolute_points, lines=np.hstack(([n], np.arange(n))))
+        self._evolute_actor = plotter.add_mesh(
+            mesh,
+            color=self.color,
+            line_width=self.line_width,
+            opacity=self.opacity
+        )
+        # Единственная ячейка-ломаная: ее длину задает offsets[1]
+        self._offsets = mesh.GetLines().GetOffsetsArray()
+        self._mesh = mesh
+        self._visible = n
+
+    def update(self, plotter, t):
+        """Показывает эволюту от 0 до текущей точки t"""
+        t = FrameContext.ensure(self.curve, t).t
+
+        if self._evolute_actor is None:
+            self._build(plotter)
+
+        visible = int(np.searchsorted(self._t_values, t, side='right'))
+        if visible == self._visible:
+            return
+        self._visible = visible
+
+        self._evolute_actor.SetVisibility(visible > 1)
+        if visible > 1:
+            self._offsets.SetValue(1, visible)
+            self._offsets.Modified()
+            self._mesh.GetLines().Modified()
+            self._mesh.Modified()
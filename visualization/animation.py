@@ -3,38 +3,83 @@ import pyvista as pv
 import numpy as np
 import threading
 import time
+from collections import deque
 from typing import Callable
 from visualization.animation_modes import AnimationMode
+from visualization.frame_context import FrameContext
+from visualization.glyphs import ArrowGlyphSet
+from visualization.picking import CurvePicker, trajectory_mesh
 
 
 class AnimationEngine:
-    """Чистый движок анимации с бесконечным циклом"""
+    """
+    Чистый движок анимации с бесконечным циклом
 
-    def __init__(self, curve=None, num_frames: int = 300, frame_delay: float = 0.05, speed: float = 1.0):
+    ★ Номер кадра берется из монотонных часов: frame = elapsed // frame_delay.
+    Если цикл не успел (GIL, тяжелый кадр), пропущенные кадры не
+    догоняются — анимация идет со скоростью реального времени.
+    """
+
+    # Сколько последних тиков учитывать в статистике
+    STATS_WINDOW = 120
+
+    def __init__(self, curve=None, num_frames: int = 300, frame_delay: float = 0.05, speed: float = 1.0,
+                 uniform_speed: bool = False):
         """
         Args:
             curve: Curve3D объект (опционально)
             num_frames: количество кадров в одном цикле
-            frame_delay: задержка между кадрами в секундах
+            frame_delay: период кадра в секундах
             speed: скорость проигрывания (не используется в новой версии)
+            uniform_speed: шагать равномерно по длине дуги, а не по t
+                           (требует curve)
         """
+        if uniform_speed and curve is None:
+            raise ValueError("uniform_speed requires a curve")
+
         self.curve = curve
         self.num_frames = num_frames
         self.frame_delay = frame_delay
         self.speed = speed
         self.current_t = 0.0
+        # ★ Номер опубликованного кадра: меняется только вместе с current_t
+        self.sequence = 0
         self.stop_event = threading.Event()
         self.calculation_thread = None
         self.frame_count = 0
         self.start_time = None
 
+        # Статистика планировщика
+        self.late_frames = 0
+        self.skipped_frames = 0
+        self._tick_times = deque(maxlen=self.STATS_WINDOW)
+        self._tick_lateness = deque(maxlen=self.STATS_WINDOW)
+
+        # ★ Таблица t для каждого кадра считается один раз:
+        # в цикле остается только индексация
+        self._t_table = None
+        if uniform_speed:
+            lengths = np.arange(num_frames) / num_frames * curve.total_length
+            self._t_table = curve.t_at_length(lengths).tolist()
+
+    def _frame_to_t(self, frame: int) -> float:
+        """Параметр t для номера кадра"""
+        index = frame % self.num_frames
+        if self._t_table is not None:
+            return self._t_table[index]
+        return index / self.num_frames
+
     def start(self):
         """Запустить расчеты"""
         print("🎬 Поток расчетов запущен")
 
         self.stop_event.clear()
         self.frame_count = 0
-        self.start_time = time.time()
+        self.late_frames = 0
+        self.skipped_frames = 0
+        self._tick_times.clear()
+        self._tick_lateness.clear()
+        self.start_time = time.monotonic()
         self.calculation_thread = threading.Thread(
             target=self._calculation_loop, daemon=True
         )
@@ -42,16 +87,39 @@ class AnimationEngine:
 
     def _calculation_loop(self):
         """Цикл расчетов - работает бесконечно"""
-        frame = 0
+        period = self.frame_delay
+        last_frame = -1
         try:
             while not self.stop_event.is_set():
-                self.current_t = (frame % self.num_frames) / self.num_frames
+                now = time.monotonic()
+                if period > 0:
+                    frame = int((now - self.start_time) / period)
+                    # Тик опоздал, если проснулся уже в следующем кадре
+                    lateness = now - self.start_time - (last_frame + 1) * period
+                    if frame > last_frame + 1:
+                        self.late_frames += 1
+                        self.skipped_frames += frame - last_frame - 1
+                    else:
+                        frame = last_frame + 1
+                else:
+                    frame = last_frame + 1
+                    lateness = 0.0
+
+                # Сначала t, потом номер: читатель берет sequence, затем current_t
+                self.current_t = self._frame_to_t(frame)
+                self.sequence += 1
                 self.frame_count = frame
-                frame += 1
-                time.sleep(self.frame_delay)
+                last_frame = frame
+
+                self._tick_times.append(now)
+                self._tick_lateness.append(max(lateness, 0.0))
+
+                # ★ Ждем до начала следующего кадра по часам, а не sleep(period)
+                self.stop_event.wait(max(self.start_time + (frame + 1) * period - time.monotonic(), 0.0))
         finally:
-            elapsed = time.time() - self.start_time
-            print(f"🛑 Поток расчетов остановлен (всего кадров: {self.frame_count}, прошло: {elapsed:.1f}с)")
+            elapsed = time.monotonic() - self.start_time
+            print(f"🛑 Поток расчетов остановлен (всего кадров: {self.frame_count}, прошло: {elapsed:.1f}с, "
+                  f"пропущено: {self.skipped_frames})")
 
     def stop(self):
         """Остановить расчеты"""
@@ -60,23 +128,47 @@ class AnimationEngine:
             self.calculation_thread.join(timeout=1.0)
 
     def get_fps(self) -> float:
-        """Получить текущий FPS"""
-        if self.frame_delay > 0:
-            return 1.0 / self.frame_delay
-        return 0.0
+        """Получить текущий FPS (измеренный по последним тикам)"""
+        ticks = list(self._tick_times)
+        if len(ticks) < 2 or ticks[-1] <= ticks[0]:
+            return 0.0
+        return (len(ticks) - 1) / (ticks[-1] - ticks[0])
+
+    def get_stats(self) -> dict:
+        """
+        Статистика планировщика
+
+        Returns:
+            target_fps — заданная частота (1 / frame_delay)
+            measured_fps — измеренная частота тиков
+            jitter_ms — СКО опоздания тика относительно расписания
+            late_frames — тиков, проснувшихся позже следующего кадра
+            skipped_frames — кадров, пропущенных из-за опозданий
+            frames — номер последнего кадра
+        """
+        lateness = np.array(list(self._tick_lateness))
+        return {
+            'target_fps': 1.0 / self.frame_delay if self.frame_delay > 0 else 0.0,
+            'measured_fps': self.get_fps(),
+            'jitter_ms': float(lateness.std() * 1000) if len(lateness) else 0.0,
+            'late_frames': self.late_frames,
+            'skipped_frames': self.skipped_frames,
+            'frames': self.frame_count,
+        }
 
     def get_elapsed_time(self) -> float:
         """Получить прошедшее время с начала анимации"""
         if self.start_time is None:
             return 0.0
-        return time.time() - self.start_time
+        return time.monotonic() - self.start_time
 
 
 class CurveVisualizer:
     """Визуализация кривой"""
 
     def __init__(self, curve, engine, window_size=(1000, 800), mode: AnimationMode = AnimationMode.CONTINUOUS,
-                 num_steps: int = 10):
+                 num_steps: int = 10, picking: str = "click", max_accumulated: int = None,
+                 accumulated_policy: str = "decimate"):
         """
         Args:
             curve: объект кривой
@@ -84,14 +176,27 @@ class CurveVisualizer:
             window_size: размер окна
             mode: режим анимации (CONTINUOUS, STEPPED, ACCUMULATED)
             num_steps: количество шагов для STEPPED и ACCUMULATED режимов
+            picking: подсказка t, s, κ, τ, R на траектории —
+                     "click", "hover" или None (выключена)
+            max_accumulated: предел числа касательных в ACCUMULATED
+                             (None — без предела)
+            accumulated_policy: что делать при пределе — "decimate"
+                                или "drop_oldest" (см. ArrowGlyphSet)
         """
+        if accumulated_policy not in ArrowGlyphSet.POLICIES:
+            raise ValueError(f"Unknown accumulated_policy: {accumulated_policy}")
+
         self.curve = curve
         self.engine = engine
         self.window_size = window_size
         self.mode = mode
         self.num_steps = num_steps
+        self.picking = picking
+        self.max_accumulated = max_accumulated
+        self.accumulated_policy = accumulated_policy
 
         self.plotter = None
+        self.picker = None
         self.render_thread = None
         self.stop_event = threading.Event()
 
@@ -101,11 +206,17 @@ class CurveVisualizer:
 
         self._trajectory_actor = None
         self._last_step_index = -1
-        self._accumulated_actors = []
+        self._accumulated = None
 
         self._last_stepped_t = None
         self._update_count = 0
 
+        # ★ Пропуск кадров без изменений: номер кадра движка и MTime камеры
+        self._last_sequence = None
+        self._last_camera_mtime = None
+        self.rendered_frames = 0
+        self.skipped_frames = 0
+
     def add_actor(self, actor):
         """Добавить актор"""
         self.actor_manager.add_actor(actor)
@@ -123,14 +234,19 @@ class CurveVisualizer:
         self.plotter.set_background("black")
 
         # ★ Добавляем полную траекторию один раз
-        t_values = np.linspace(0, 1, 300)
-        positions = self.curve.position(t_values)
-        self.plotter.add_mesh(
-            pv.lines_from_points(positions),
+        t_values, positions = self.curve.tessellate(tol=1e-3)
+        trajectory = trajectory_mesh(t_values, positions)
+        self._trajectory_actor = self.plotter.add_mesh(
+            trajectory,
             color="yellow",
             line_width=3
         )
 
+        # ★ Пикинг работает по тому же мешу траектории
+        if self.picking:
+            self.picker = CurvePicker(self.curve, trajectory, self._trajectory_actor)
+            self.picker.attach(self.plotter, hover=(self.picking == "hover"))
+
         self.plotter.show(interactive_update=True, auto_close=False)
         print("🖼️ Плоттер инициализирован\n")
 
@@ -139,18 +255,32 @@ class CurveVisualizer:
             iren = self.plotter.iren
             while not self.stop_event.is_set():
                 try:
+                    sequence = self.engine.sequence
                     current_t = self.engine.current_t
 
-                    # ★ Обработка в зависимости от режима
-                    if self.mode == AnimationMode.CONTINUOUS:
-                        self._update_continuous(current_t)
-                    elif self.mode == AnimationMode.STEPPED:
-                        self._update_stepped(current_t)
-                    elif self.mode == AnimationMode.ACCUMULATED:
-                        self._update_accumulated(current_t)
+                    # ★ Акторы обновляются только для нового кадра движка
+                    frame_changed = sequence != self._last_sequence
+                    if frame_changed:
+                        self._last_sequence = sequence
+
+                        # ★ Обработка в зависимости от режима
+                        if self.mode == AnimationMode.CONTINUOUS:
+                            self._update_continuous(current_t)
+                        elif self.mode == AnimationMode.STEPPED:
+                            self._update_stepped(current_t)
+                        elif self.mode == AnimationMode.ACCUMULATED:
+                            self._update_accumulated(current_t)
 
                     iren.process_events()
-                    self.plotter.render()
+
+                    # ★ Рендер — только если изменился кадр или камера
+                    camera_mtime = self.plotter.camera.GetMTime()
+                    if frame_changed or camera_mtime != self._last_camera_mtime:
+                        self._last_camera_mtime = camera_mtime
+                        self.plotter.render()
+                        self.rendered_frames += 1
+                    else:
+                        self.skipped_frames += 1
                     time.sleep(0.016)
 
                 except RuntimeError:
@@ -166,7 +296,8 @@ class CurveVisualizer:
             except:
                 pass
 
-        print("🛑 Поток рендеринга остановлен")
+        print(f"🛑 Поток рендеринга остановлен (отрисовано: {self.rendered_frames}, "
+              f"пропущено: {self.skipped_frames})")
 
     def _update_continuous(self, current_t: float):
         """★ Режим 1: Касательная движется плавно"""
@@ -224,23 +355,18 @@ class CurveVisualizer:
 
     def _add_accumulated_tangent(self, t: float):
         """★ Добавляет новую касательную на позицию t"""
-        from visualization.actors import ArrowActor
-
-        # Создаем новую касательную в этой позиции
-        new_tangent = ArrowActor(
-            self.curve,
-            "tangent",
-            scale=0.3,
-            color="red",
-            smoothing=0.0
-        )
-
-        # Сразу обновляем её до нужной позиции
-        new_tangent.update(self.plotter, t)
-
-        # Сохраняем в список
-        self._accumulated_actors.append(new_tangent)
-        print(f"✅ Добавлена касательная #{len(self._accumulated_actors)}")
+        # ★ Все касательные — один инстансный актор
+        if self._accumulated is None:
+            self._accumulated = ArrowGlyphSet(
+                self.plotter,
+                color="red",
+                max_glyphs=self.max_accumulated,
+                policy=self.accumulated_policy
+            )
+
+        ctx = FrameContext(self.curve, t)
+        if self._accumulated.append(ctx.position, ctx.tangent):
+            print(f"✅ Добавлена касательная #{len(self._accumulated)}")
 
     def show(self):
         """Запустить визуализацию"""
@@ -2,6 +2,8 @@
 import numpy as np
 import pyvista as pv
 from abc import ABC, abstractmethod
+from vtkmodules.vtkCommonMath import vtkMatrix4x4
+from visualization.frame_context import FrameContext
 
 
 class BaseActor(ABC):
@@ -27,10 +29,13 @@ class BaseActor(ABC):
         self._last_direction = None
 
     @abstractmethod
-    def _compute_geometry(self, t: float) -> tuple:
+    def _compute_geometry(self, ctx: FrameContext) -> tuple:
         """
         Вычислить геометрию актора
 
+        Args:
+            ctx: FrameContext текущего кадра (общий для всех акторов)
+
         Returns:
             (position, direction) или (position, shape)
         """
@@ -54,11 +59,14 @@ class BaseActor(ABC):
         smoothed = last_value * self.smoothing + new_value * (1 - self.smoothing)
         return smoothed
 
-    def update(self, plotter, t: float):
+    def update(self, plotter, t):
         """
         Обновить актор БЕЗ удаления (не мигает)
+
+        Args:
+            t: параметр (float) или FrameContext текущего кадра
         """
-        position, direction = self._compute_geometry(t)
+        position, direction = self._compute_geometry(FrameContext.ensure(self.curve, t))
 
         position = self._smooth_value(position, self._last_position, is_vector=False)
         direction = self._smooth_value(direction, self._last_direction, is_vector=False)
@@ -108,4 +116,65 @@ class BaseActor(ABC):
     @abstractmethod
     def _create_mesh(self, position: np.ndarray, direction: np.ndarray, plotter):
         """Создать и добавить mesh в plotter (первый раз)"""
-        pass
\ No newline at end of file
+        pass
+
+
+def arrow_matrix(position: np.ndarray, direction: np.ndarray, length: float) -> np.ndarray:
+    """
+    Матрица 4×4, переводящая единичную стрелку pv.Arrow() (из начала
+    координат вдоль +x) в стрелку длины length из position вдоль direction
+
+    Нулевое направление дает вырожденную (нулевую) стрелку.
+    """
+    matrix = np.eye(4)
+    matrix[:3, 3] = position
+
+    norm = np.linalg.norm(direction)
+    if not norm > 0:
+        matrix[:3, :3] = 0
+        return matrix
+
+    # Ортонормированный базис с первой осью вдоль direction
+    e1 = direction / norm
+    helper = np.zeros(3)
+    helper[np.argmin(np.abs(e1))] = 1.0
+    e2 = np.cross(e1, helper)
+    e2 /= np.linalg.norm(e2)
+    e3 = np.cross(e1, e2)
+
+    matrix[:3, :3] = np.column_stack((e1, e2, e3)) * length
+    return matrix
+
+
+class ArrowGlyphActor(BaseActor):
+    """
+    Стрелка, которая строится один раз
+
+    ★ Меш — единичная стрелка pv.Arrow(); в кадре меняется только
+    user matrix актора (сдвиг, поворот, масштаб), без новых мешей.
+    """
+
+    # Длина стрелки на экране
+    glyph_scale = 0.1
+
+    def __init__(self, curve, color: str = "white", smoothing: float = 0.0):
+        super().__init__(curve, color, smoothing)
+        self._matrix = vtkMatrix4x4()
+
+    def _set_matrix(self, position: np.ndarray, direction: np.ndarray):
+        self._matrix.DeepCopy(arrow_matrix(position, direction, self.glyph_scale).ravel())
+
+    def _create_mesh_geometry(self, position: np.ndarray, direction: np.ndarray):
+        """★ Создает меш БЕЗ добавления в plotter"""
+        return pv.Arrow()
+
+    def _create_mesh(self, position: np.ndarray, direction: np.ndarray, plotter):
+        """★ Создает и добавляет меш в plotter (первый раз)"""
+        actor = plotter.add_mesh(self._create_mesh_geometry(position, direction), color=self.color)
+        self._set_matrix(position, direction)
+        actor.SetUserMatrix(self._matrix)
+        return actor
+
+    def _update_actor_position(self, position: np.ndarray, direction: np.ndarray, plotter):
+        """★ Обновляет только матрицу преобразования актора"""
+        self._set_matrix(position, direction)
@@ -0,0 +1,99 @@
+# visualization/frame_context.py
+import numpy as np
+from core.curve import FRAME_FIELDS
+
+
+class FrameContext:
+    """
+    Геометрия кривой в одной точке t, общая для всех акторов кадра
+
+    Кривая вычисляется один раз (при первом запросе) через скалярный
+    путь Curve3D.evaluate_at; производные величины берутся из него
+    и запоминаются.
+    """
+
+    def __init__(self, curve, t: float):
+        """
+        Args:
+            curve: объект Curve3D
+            t: параметр текущего кадра
+        """
+        self.curve = curve
+        self.t = float(t)
+
+        self._frame = None
+        self._rmf = None
+        self._values = {}
+
+    @classmethod
+    def ensure(cls, curve, t) -> "FrameContext":
+        """Вернуть контекст для curve (t — float или уже готовый FrameContext)"""
+        if isinstance(t, FrameContext):
+            if t.curve is curve:
+                return t
+            t = t.t
+        return cls(curve, t)
+
+    def _evaluate(self):
+        """★ Единственный запрос к кривой: все поля FrameBundle в точке t"""
+        if self._frame is None:
+            self._frame = self.curve.evaluate_at(self.t)
+        return self._frame
+
+    def get(self, name: str):
+        """Получить величину по имени (поле FrameBundle или velocity)"""
+        if name not in self._values:
+            if name == 'velocity':
+                self._values[name] = self.get('tangent') * self.get('speed')
+            elif name in FRAME_FIELDS:
+                self._values[name] = getattr(self._evaluate(), name)
+            else:
+                raise ValueError(f"Unknown frame field: {name}")
+        return self._values[name]
+
+    @property
+    def rmf(self) -> tuple:
+        """Rotation-minimizing frame (T, U, V) из таблицы кривой"""
+        if self._rmf is None:
+            T, U, V = self.curve.rotation_minimizing_frame(np.array([self.t]))
+            self._rmf = (T[0], U[0], V[0])
+        return self._rmf
+
+    @property
+    def position(self) -> np.ndarray:
+        return self.get('position')
+
+    @property
+    def velocity(self) -> np.ndarray:
+        return self.get('velocity')
+
+    @property
+    def tangent(self) -> np.ndarray:
+        return self.get('tangent')
+
+    @property
+    def normal(self) -> np.ndarray:
+        return self.get('normal')
+
+    @property
+    def binormal(self) -> np.ndarray:
+        return self.get('binormal')
+
+    @property
+    def curvature(self) -> float:
+        return self.get('curvature')
+
+    @property
+    def torsion(self) -> float:
+        return self.get('torsion')
+
+    @property
+    def speed(self) -> float:
+        return self.get('speed')
+
+    @property
+    def radius(self) -> float:
+        return self.get('radius')
+
+    def __repr__(self):
+        return f"FrameContext(t={self.t:.4f}, computed={list(self._values)})"
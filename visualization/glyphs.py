@@ -0,0 +1,125 @@
+# visualization/glyphs.py
+import numpy as np
+import pyvista as pv
+from vtkmodules.util.numpy_support import numpy_to_vtk
+from vtkmodules.vtkCommonCore import vtkPoints
+from vtkmodules.vtkRenderingCore import vtkActor, vtkGlyph3DMapper
+
+
+class ArrowGlyphSet:
+    """
+    Набор одинаковых стрелок одним актором (инстансинг через vtkGlyph3DMapper)
+
+    ★ Начала и направления стрелок лежат в заранее выделенных массивах,
+    новая стрелка дописывается в конец; при заполнении емкость
+    удваивается. Число VTK-акторов не растет с числом стрелок.
+
+    При max_glyphs стрелок срабатывает политика:
+        "decimate" — оставить каждую вторую стрелку и дальше принимать
+                     только каждую вторую новую (покрытие остается
+                     равномерным, шаг удваивается)
+        "drop_oldest" — удалить самую старую стрелку
+    """
+
+    POLICIES = ("decimate", "drop_oldest")
+
+    def __init__(self, plotter, color: str = "red", glyph_scale: float = 0.1,
+                 capacity: int = 256, max_glyphs: int = None, policy: str = "decimate"):
+        """
+        Args:
+            plotter: pv.Plotter
+            color: цвет стрелок
+            glyph_scale: длина стрелки
+            capacity: начальная емкость массивов
+            max_glyphs: предел числа стрелок (None — без предела)
+            policy: что делать при достижении предела — "decimate" или "drop_oldest"
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown policy: {policy}")
+        if max_glyphs is not None and max_glyphs < 2:
+            raise ValueError("max_glyphs must be at least 2")
+
+        self.max_glyphs = max_glyphs
+        self.policy = policy
+
+        self._positions = np.zeros((capacity, 3))
+        self._directions = np.zeros((capacity, 3))
+        self._count = 0
+        self._stride = 1
+        self._offered = 0
+
+        self._polydata = pv.PolyData()
+
+        self._mapper = vtkGlyph3DMapper()
+        self._mapper.SetInputData(self._polydata)
+        self._mapper.SetSourceData(pv.Arrow())
+        self._mapper.SetOrientationArray("direction")
+        self._mapper.SetOrientationModeToDirection()
+        self._mapper.SetScaleModeToNoDataScaling()
+        self._mapper.SetScaleFactor(glyph_scale)
+
+        self.actor = vtkActor()
+        self.actor.SetMapper(self._mapper)
+        self.actor.GetProperty().SetColor(pv.Color(color).float_rgb)
+        self._sync()
+        plotter.add_actor(self.actor)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, position: np.ndarray, direction: np.ndarray) -> bool:
+        """
+        Добавить стрелку
+
+        Returns:
+            True, если стрелка добавлена (при "decimate" часть
+            новых стрелок пропускается)
+        """
+        self._offered += 1
+        if (self._offered - 1) % self._stride:
+            return False
+
+        if self.max_glyphs is not None and self._count >= self.max_glyphs:
+            if self.policy == "decimate":
+                kept = self._count // 2 + self._count % 2
+                self._positions[:kept] = self._positions[:self._count:2]
+                self._directions[:kept] = self._directions[:self._count:2]
+                self._count = kept
+                self._stride *= 2
+                # Новая стрелка попадает в сетку, только если ее номер кратен шагу
+                if (self._offered - 1) % self._stride:
+                    self._sync()
+                    return False
+            else:
+                self._positions[:self._count - 1] = self._positions[1:self._count]
+                self._directions[:self._count - 1] = self._directions[1:self._count]
+                self._count -= 1
+
+        if self._count == len(self._positions):
+            self._positions = np.concatenate((self._positions, np.zeros_like(self._positions)))
+            self._directions = np.concatenate((self._directions, np.zeros_like(self._directions)))
+
+        self._positions[self._count] = position
+        self._directions[self._count] = direction
+        self._count += 1
+        self._sync()
+        return True
+
+    def clear(self):
+        """Удалить все стрелки"""
+        self._count = 0
+        self._stride = 1
+        self._offered = 0
+        self._sync()
+
+    def _sync(self):
+        """★ Передать в VTK видимую часть массивов (без копирования)"""
+        n = self._count
+        points = vtkPoints()
+        points.SetData(numpy_to_vtk(self._positions[:n], deep=False))
+        self._polydata.SetPoints(points)
+
+        directions = numpy_to_vtk(self._directions[:n], deep=False)
+        directions.SetName("direction")
+        self._polydata.GetPointData().AddArray(directions)
+        self._polydata.Modified()
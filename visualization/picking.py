@@ -0,0 +1,121 @@
+# visualization/picking.py
+import numpy as np
+import pyvista as pv
+from vtkmodules.vtkCommonDataModel import vtkStaticCellLocator
+from vtkmodules.vtkRenderingCore import vtkCellPicker
+
+
+def trajectory_mesh(t_values: np.ndarray, positions: np.ndarray) -> pv.PolyData:
+    """Ломаная траектории с параметром t в каждой вершине (point_data['t'])"""
+    mesh = pv.lines_from_points(positions)
+    mesh.point_data['t'] = t_values
+    return mesh
+
+
+class CurvePicker:
+    """
+    Подсказка с t, длиной дуги, κ, τ и R в точке траектории под курсором
+
+    Отрезок траектории ищется vtkCellPicker через заранее построенный
+    локатор ячеек меша траектории, t — интерполяция point_data['t']
+    по отрезку; кривая вычисляется один раз в найденной точке.
+    """
+
+    def __init__(self, curve, mesh: pv.PolyData, actor, tolerance: float = 0.005,
+                 color: str = "white", font_size: int = 10):
+        """
+        Args:
+            curve: объект Curve3D
+            mesh: меш траектории из trajectory_mesh()
+            actor: актор этого меша в plotter
+            tolerance: допуск пикинга (доля диагонали окна)
+            color: цвет подсказки и маркера
+            font_size: размер шрифта подсказки
+        """
+        self.curve = curve
+        self.mesh = mesh
+        self.t_values = np.asarray(mesh.point_data['t'])
+        self.color = color
+        self.font_size = font_size
+
+        # ★ Локатор строится один раз — пик не перебирает все отрезки
+        self._locator = vtkStaticCellLocator()
+        self._locator.SetDataSet(mesh)
+        self._locator.BuildLocator()
+
+        self._picker = vtkCellPicker()
+        self._picker.SetTolerance(tolerance)
+        self._picker.PickFromListOn()
+        self._picker.AddPickList(actor)
+        self._picker.AddLocator(self._locator)
+
+        self.plotter = None
+        self.last_pick = None
+        self._text = None
+        self._marker = None
+
+    def attach(self, plotter, hover: bool = False):
+        """
+        Подключить к plotter
+
+        Args:
+            hover: обновлять подсказку при движении мыши (иначе — по клику)
+        """
+        self.plotter = plotter
+
+        self._marker = plotter.add_mesh(
+            pv.Sphere(radius=self.mesh.length * 0.005),
+            color=self.color,
+            pickable=False,
+            reset_camera=False
+        )
+        self._marker.SetVisibility(False)
+        self._text = plotter.add_text("", position=(10, 10), font_size=self.font_size, color=self.color)
+
+        event = "MouseMoveEvent" if hover else "LeftButtonPressEvent"
+        plotter.iren.add_observer(event, self._on_mouse_event)
+
+    def pick(self, x: int, y: int):
+        """
+        Найти точку траектории под экранной позицией (x, y)
+
+        Returns:
+            dict с t, s, position, curvature, torsion, radius или None
+        """
+        if not self._picker.Pick(x, y, 0, self.plotter.renderer):
+            return None
+        cell = self._picker.GetCellId()
+        if cell < 0:
+            return None
+
+        # Отрезок cell соединяет вершины cell и cell + 1
+        u = self._picker.GetPCoords()[0]
+        t = float(self.t_values[cell] + u * (self.t_values[cell + 1] - self.t_values[cell]))
+
+        frame = self.curve.evaluate_at(t, ('position', 'curvature', 'torsion', 'radius'))
+        self.last_pick = {
+            't': t,
+            's': float(self.curve.length_at_t(t)),
+            'position': frame.position,
+            'curvature': frame.curvature,
+            'torsion': frame.torsion,
+            'radius': frame.radius,
+        }
+        return self.last_pick
+
+    def _on_mouse_event(self, obj, event):
+        x, y = self.plotter.iren.get_event_position()
+        info = self.pick(x, y)
+        if info is None:
+            return
+
+        self._text.SetInput(
+            f"t = {info['t']:.4f}\n"
+            f"s = {info['s']:.4f}\n"
+            f"curvature = {info['curvature']:.4f}\n"
+            f"torsion = {info['torsion']:.4f}\n"
+            f"radius = {info['radius']:.4f}"
+        )
+        self._marker.SetPosition(*info['position'])
+        self._marker.SetVisibility(True)
+        self.plotter.render()